@@ -0,0 +1,46 @@
+"""Shared building blocks for Artemis watch games.
+
+Nothing is imported up front: `import engine` is free, and each submodule
+(or a class re-exported below) is imported the first time it is touched,
+so a game pays startup time and RAM only for the parts it uses:
+
+    from engine import GameLoop, EntityStore   # imports loop and store only
+    import engine.collide                      # plain submodule imports work too
+"""
+
+# name -> submodule that defines it
+_EXPORTS = {
+    "AnimClock": "anim",
+    "Bitmap": "bitmap", "SpriteStrip": "bitmap",
+    "probe_blit": "bitmap", "probe_palette_blit": "bitmap", "make_palette": "bitmap",
+    "rgb565": "colors", "named": "colors",
+    "aabb": "collide", "UniformGrid": "collide", "mask_hits_rect": "collide",
+    "Controls": "controls",
+    "Governor": "governor",
+    "Hud": "hud",
+    "GameLoop": "loop",
+    "Profiler": "profiler",
+    "DirtyRenderer": "render",
+    "Recorder": "replay", "Player": "replay",
+    "Sequencer": "sound",
+    "SpriteCache": "spritecache",
+    "SpriteManager": "sprites",
+    "Starfield": "starfield",
+    "EntityStore": "store",
+    "Scheduler": "tasks",
+}
+
+_SUBMODULES = ("anim", "atlas", "bitmap", "collide", "colors", "controls", "governor",
+               "hud", "kernels", "loop", "procgen", "profiler", "render", "replay",
+               "sound", "spritecache", "sprites", "starfield", "store", "tasks")
+
+def __getattr__(name):
+    mod = _EXPORTS.get(name)
+    if mod is None:
+        if name not in _SUBMODULES:
+            raise AttributeError(name)
+        mod = name
+    m = __import__("engine." + mod, None, None, (mod,))
+    value = m if mod == name else getattr(m, name)
+    globals()[name] = value   # later lookups skip this hook
+    return value
@@ -0,0 +1,29 @@
+"""Shared animation clock: frames derived from time, not per-entity timers."""
+
+FP_SHIFT = 16  # rates are frames per ms in 16.16 fixed point
+
+class AnimClock:
+    """One integer millisecond clock for every looping animation.
+
+    An entity stores only a phase origin (clock time at which it was on
+    frame 0) and a fixed-point rate; frame() derives its current frame with
+    integer math whenever it is needed. Nothing is updated per entity per
+    frame, and a long or dropped frame cannot lose animation frames.
+    """
+
+    def __init__(self):
+        self.now = 0
+
+    def advance(self, ms):
+        self.now += ms
+
+    def rate(self, frames_per_s):
+        """Fixed-point rate for a speed in frames per second (> 0)"""
+        return max(1, int(frames_per_s * (1 << FP_SHIFT) / 1000 + 0.5))
+
+    def origin(self, rate, start_frame=0):
+        """Phase origin that puts an animation on start_frame right now"""
+        return self.now + ((-start_frame << FP_SHIFT) // rate)  # rounds toward -inf
+
+    def frame(self, origin, rate, frames):
+        return (((self.now - origin) * rate) >> FP_SHIFT) % frames
@@ -0,0 +1,76 @@
+"""Binary sprite atlas: many frames of one pixel format packed into a file.
+
+Layout (little-endian):
+    header  magic "SPAT", version u8, format u8, frame count u16, param hash u32
+    table   frame count x (w u16, h u16, offset u32)  - offset from file start
+    pixels  raw frame data, back to back
+"""
+import os
+import struct
+
+MAGIC = b"SPAT"
+VERSION = 2
+
+# pixel formats
+FMT_RGB565 = 0   # 2 bytes per pixel
+FMT_GS4 = 1      # GS4_HMSB, rows padded to a whole byte
+_HEADER = "<4sBBHI"
+_ENTRY = "<HHI"
+_HEADER_SIZE = struct.calcsize(_HEADER)
+_ENTRY_SIZE = struct.calcsize(_ENTRY)
+
+def param_hash(*params):
+    """32-bit FNV-1a of the generator parameters, used to detect stale atlases"""
+    h = 0x811C9DC5
+    for ch in repr(params).encode():
+        h = ((h ^ ch) * 0x01000193) & 0xFFFFFFFF
+    return h
+
+def frame_size(w, h, fmt):
+    if fmt == FMT_GS4:
+        return ((w + 1) >> 1) * h
+    return w * h * 2
+
+def write_atlas(path, frames, phash, fmt=FMT_RGB565):
+    """frames: list of (w, h, data) tuples, written in order"""
+    offset = _HEADER_SIZE + _ENTRY_SIZE * len(frames)
+    with open(path, "wb") as f:
+        f.write(struct.pack(_HEADER, MAGIC, VERSION, fmt, len(frames), phash))
+        for w, h, data in frames:
+            f.write(struct.pack(_ENTRY, w, h, offset))
+            offset += len(data)
+        for w, h, data in frames:
+            f.write(data)
+
+def read_index(path, phash, fmt=FMT_RGB565):
+    """Return [(w, h, offset)] without reading any pixel data, or None if
+    the file is missing, malformed, in another format or was built from
+    different parameters. Pair with read_frame() to load frames on demand."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_HEADER_SIZE)
+            if len(head) < _HEADER_SIZE:
+                return None
+            magic, version, file_fmt, count, file_hash = struct.unpack(_HEADER, head)
+            if magic != MAGIC or version != VERSION or file_fmt != fmt or file_hash != phash:
+                return None
+            table = f.read(_ENTRY_SIZE * count)
+        size = os.stat(path)[6]
+    except OSError:
+        return None
+    if len(table) < _ENTRY_SIZE * count:
+        return None
+    index = []
+    for n in range(count):
+        w, h, off = struct.unpack_from(_ENTRY, table, n * _ENTRY_SIZE)
+        if off + frame_size(w, h, fmt) > size:
+            return None
+        index.append((w, h, off))
+    return index
+
+def read_frame(f, w, h, offset, fmt=FMT_RGB565):
+    """One frame's pixels from an open atlas file, as a new bytearray"""
+    buf = bytearray(frame_size(w, h, fmt))
+    f.seek(offset)
+    f.readinto(buf)
+    return buf
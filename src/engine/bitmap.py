@@ -0,0 +1,92 @@
+"""Blit probes, palettes, and string-art bitmaps compiled once into rect runs."""
+from array import array
+from framebuf import FrameBuffer, MONO_HLSB, RGB565
+
+def probe_blit(display):
+    """True if display.blit accepts our FrameBuffers; decided once at startup"""
+    try:
+        display.blit(FrameBuffer(bytearray(2), 1, 1, RGB565), -1, -1, 0)  # clipped away
+        return True
+    except:
+        return False
+
+def probe_palette_blit(display):
+    """True if display.blit also takes a palette FrameBuffer"""
+    try:
+        src = FrameBuffer(bytearray(1), 1, 1, MONO_HLSB)
+        display.blit(src, -1, -1, 0, make_palette((0,)))  # clipped away
+        return True
+    except:
+        return False
+
+def make_palette(colors, key=0):
+    """Palette FrameBuffer for indexed blits: entry 0 = key, k = colors[k-1]"""
+    pal = FrameBuffer(bytearray(2 * (len(colors) + 1)), len(colors) + 1, 1, RGB565)
+    pal.pixel(0, 0, key)
+    for k, c in enumerate(colors):
+        pal.pixel(k + 1, 0, c)
+    return pal
+
+def size(rows):
+    return (len(rows[0]), len(rows))
+
+def to_spans(rows):
+    """Horizontal runs of filled pixels as flat (x, y, w) triples"""
+    spans = array("h")
+    for j, row in enumerate(rows):
+        i, n = 0, len(row)
+        while i < n:
+            if row[i] != "X":
+                i += 1
+                continue
+            start = i
+            while i < n and row[i] == "X":
+                i += 1
+            spans.append(start)
+            spans.append(j)
+            spans.append(i - start)
+    return spans
+
+def draw_spans(display, spans, x, y, color):
+    for o in range(0, len(spans), 3):
+        display.rect(x + spans[o], y + spans[o + 1], spans[o + 2], 1, color, True)
+
+class Bitmap:
+    """String art ('X' = filled) for displays without blit, drawn as one
+    rect per horizontal run."""
+
+    def __init__(self, rows, color):
+        self.w, self.h = size(rows)
+        self.color = color
+        self.spans = to_spans(rows)
+
+    def draw(self, display, x, y):
+        draw_spans(display, self.spans, int(x), int(y), self.color)
+
+class SpriteStrip:
+    """n same-size RGB565 frames in one buffer (one FrameBuffer view per
+    frame), each drawn with a single keyed blit. Frames are painted from
+    string art with a per-frame char -> color map, so animated effects
+    cost the same to draw as a still sprite."""
+
+    def __init__(self, w, h, n, key=0):
+        self.w, self.h, self.n = w, h, n
+        self.key = key
+        size = w * h * 2
+        self.buf = bytearray(size * n)
+        mv = memoryview(self.buf)
+        self.frames = [FrameBuffer(mv[size * k:size * (k + 1)], w, h, RGB565) for k in range(n)]
+        for fb in self.frames:
+            fb.fill(key)
+
+    def paint(self, k, rows, colors):
+        """Frame k from string art; chars missing from colors stay transparent"""
+        fb = self.frames[k]
+        for j, row in enumerate(rows):
+            for i, ch in enumerate(row):
+                c = colors.get(ch)
+                if c is not None:
+                    fb.pixel(i, j, c)
+
+    def draw(self, display, k, x, y):
+        display.blit(self.frames[k], x, y, self.key)
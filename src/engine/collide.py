@@ -0,0 +1,109 @@
+"""Collision helpers: AABB test and a uniform-grid broadphase."""
+from engine.kernels import aabb, gs4_mask
+
+class UniformGrid:
+    """Spatial hash over a fixed playfield with two layers (e.g. targets and
+    projectiles). Entities are re-bucketed only when the range of cells their
+    box covers changes, and pairs() yields every layer-0/layer-1 pair that
+    shares a cell exactly once."""
+
+    def __init__(self, w=128, h=128, cell_shift=4):
+        self.shift = cell_shift
+        size = 1 << cell_shift
+        self.cols = (w + size - 1) >> cell_shift
+        self.rows = (h + size - 1) >> cell_shift
+        self.cells = [([], []) for _ in range(self.cols * self.rows)]
+        self.spans = {}   # key -> (layer, c0, r0, c1, r1)
+        self.items = {}   # key -> payload handed back by pairs()
+
+    def _cells(self, span):
+        layer, c0, r0, c1, r1 = span
+        cols, cells = self.cols, self.cells
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                yield cells[r * cols + c][layer]
+
+    def update(self, key, item, layer, x1, y1, x2, y2):
+        """Insert or move an entity; cheap when it stays in the same cells"""
+        s = self.shift
+        cmax, rmax = self.cols - 1, self.rows - 1
+        c0 = min(max(int(x1) >> s, 0), cmax)
+        r0 = min(max(int(y1) >> s, 0), rmax)
+        c1 = min(max(int(x2) >> s, 0), cmax)
+        r1 = min(max(int(y2) >> s, 0), rmax)
+        self.items[key] = item
+        old = self.spans.get(key)
+        if old is not None:
+            if old[1] == c0 and old[2] == r0 and old[3] == c1 and old[4] == r1:
+                return
+            for cell in self._cells(old):
+                cell.remove(key)
+        span = (layer, c0, r0, c1, r1)
+        self.spans[key] = span
+        for cell in self._cells(span):
+            cell.append(key)
+
+    def remove(self, key):
+        span = self.spans.pop(key, None)
+        if span is not None:
+            for cell in self._cells(span):
+                cell.remove(key)
+            del self.items[key]
+
+    def clear(self):
+        for a, b in self.cells:
+            del a[:]
+            del b[:]
+        self.spans.clear()
+        self.items.clear()
+
+    def pairs(self):
+        """Yield (layer 0 item, layer 1 item) candidates from shared cells"""
+        cols, spans, items = self.cols, self.spans, self.items
+        idx = 0
+        for a_keys, b_keys in self.cells:
+            if a_keys and b_keys:
+                col, row = idx % cols, idx // cols
+                for ka in a_keys:
+                    sa = spans[ka]
+                    for kb in b_keys:
+                        sb = spans[kb]
+                        # report the pair only in the first cell both cover
+                        if (col == (sa[1] if sa[1] > sb[1] else sb[1]) and
+                                row == (sa[2] if sa[2] > sb[2] else sb[2])):
+                            yield items[ka], items[kb]
+            idx += 1
+
+# ---------- pixel masks ----------
+def indexed_mask(data, w, h):
+    """Packed 1-bit opacity mask of a GS4_HMSB sprite (index 0 transparent).
+    One bytearray, (w + 7) // 8 bytes per row, MSB = leftmost pixel."""
+    mask = bytearray(((w + 7) >> 3) * h)
+    gs4_mask(data, mask, w, h)
+    return mask
+
+def mask_hits_rect(mask, w, h, x1, y1, x2, y2):
+    """True if any opaque mask pixel lies in the inclusive local rect"""
+    if x1 < 0: x1 = 0
+    if y1 < 0: y1 = 0
+    if x2 >= w: x2 = w - 1
+    if y2 >= h: y2 = h - 1
+    if x1 > x2 or y1 > y2:
+        return False
+    stride = (w + 7) >> 3
+    b1, b2 = x1 >> 3, x2 >> 3
+    first = 0xFF >> (x1 & 7)
+    last = (0xFF << (7 - (x2 & 7))) & 0xFF
+    if b1 == b2:
+        first &= last
+    for y in range(y1, y2 + 1):
+        row = y * stride
+        if mask[row + b1] & first:
+            return True
+        if b2 > b1:
+            for b in range(b1 + 1, b2):
+                if mask[row + b]:
+                    return True
+            if mask[row + b2] & last:
+                return True
+    return False
@@ -0,0 +1,9 @@
+"""Color helpers: RGB565 packing and optional firmware colors."""
+
+def rgb565(r, g, b):
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+def named(palette, name, fallback):
+    """palette.<name> (e.g. Display.Color.Orange) if this firmware has it,
+    otherwise fallback"""
+    return getattr(palette, name, fallback)
@@ -0,0 +1,45 @@
+"""Button bindings by name that tolerate firmware without those buttons."""
+
+class Controls:
+    """Binds callbacks to Buttons.<name>, skipping names this firmware does
+    not define or cannot bind, so one game runs on every button layout.
+
+    wrap(name, pressed, cb) -> cb, if given, sees each binding first (for
+    example Recorder.bind or Player.bind); bind(..., raw=True) bypasses it.
+    """
+
+    def __init__(self, buttons, names, wrap=None):
+        self.buttons = buttons   # the Artemis buttons object
+        self.names = names       # the Buttons class with the constants
+        self.wrap = wrap
+        self.bound = []          # (name, pressed) of every binding made
+
+    def bind(self, name, pressed, cb, raw=False):
+        """True if the button exists and the callback was registered"""
+        btn = getattr(self.names, name, None)
+        if btn is None:
+            return False
+        if self.wrap is not None and not raw:
+            cb = self.wrap(name, pressed, cb)
+        try:
+            if pressed:
+                self.buttons.on_press(btn, cb)
+            else:
+                self.buttons.on_release(btn, cb)
+        except:
+            return False
+        self.bound.append((name, pressed))
+        return True
+
+    def hold(self, name, on_press, on_release):
+        """Press and release callbacks, e.g. for movement held down"""
+        return self.bind(name, True, on_press) and self.bind(name, False, on_release)
+
+    def bind_any(self, names, cb):
+        """Press callback on every listed button that exists; returns how
+        many were bound"""
+        n = 0
+        for name in names:
+            if self.bind(name, True, cb):
+                n += 1
+        return n
@@ -0,0 +1,74 @@
+"""Adaptive quality levels driven by measured frame work time."""
+
+class Governor:
+    """Trades visual quality for frame time under load.
+
+    sample(work_ms) is fed once per frame with the time the frame spent
+    working (not sleeping). Every `window` samples the mean is compared with
+    target_ms: above high percent of it the level steps up (cheaper) at
+    once; below low percent for `hold` windows in a row it steps back down.
+    The gap between the two thresholds plus the hold time is the hysteresis
+    that keeps the level from flapping at the edge of the budget.
+
+    apply(level) runs on every change; level 0 is full quality and
+    max_level the cheapest. level, avg_ms, overloaded/saturated and the step
+    counters are kept for telemetry.
+    """
+
+    def __init__(self, target_ms, max_level, apply, window=16, high=90, low=60, hold=4):
+        self.target_ms = target_ms
+        self.max_level = max_level
+        self.apply = apply
+        self.window = window
+        self.high = target_ms * high    # thresholds on the window sum * 100
+        self.low = target_ms * low
+        self.hold = hold
+        self.level = 0
+        self.avg_ms = 0.0         # mean work time of the last full window
+        self.overloaded = False   # last window was above the high threshold
+        self.saturated = False    # ...while already at the cheapest level
+        self.downs = 0            # quality reductions so far
+        self.ups = 0              # restorations
+        self._sum = 0
+        self._n = 0
+        self._calm = 0            # consecutive windows under the low threshold
+
+    def set_level(self, level):
+        level = min(max(level, 0), self.max_level)
+        if level != self.level:
+            if level > self.level:
+                self.downs += 1
+            else:
+                self.ups += 1
+            self.level = level
+            self.apply(level)
+
+    def reset(self):
+        self._sum = self._n = self._calm = 0
+        self.overloaded = self.saturated = False
+        self.set_level(0)
+
+    def sample(self, work_ms):
+        self._sum += work_ms
+        self._n += 1
+        if self._n < self.window:
+            return
+        total = self._sum * 100 // self.window
+        self.avg_ms = self._sum / self.window
+        self._sum = self._n = 0
+        self.overloaded = total > self.high
+        self.saturated = self.overloaded and self.level == self.max_level
+        if self.overloaded:
+            self._calm = 0
+            self.set_level(self.level + 1)
+        elif total < self.low:
+            self._calm += 1
+            if self._calm >= self.hold:
+                self._calm = 0
+                self.set_level(self.level - 1)
+        else:
+            self._calm = 0
+
+    def status(self):
+        return "quality level %d/%d, work %.1f/%d ms, %d down, %d up" % (
+            self.level, self.max_level, self.avg_ms, self.target_ms, self.downs, self.ups)
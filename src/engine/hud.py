@@ -0,0 +1,95 @@
+"""Cached HUD text fields, re-rasterized only when their value changes."""
+from framebuf import FrameBuffer, RGB565
+
+GLYPH = 8  # built-in font cell, pixels
+
+class Field:
+    """One HUD line: a static label followed by a value area"""
+
+    def __init__(self, x, y, label, chars, color, key):
+        self.x, self.y = x, y
+        self.label = label
+        self.label_w = GLYPH * len(label)
+        self.w = self.label_w + GLYPH * chars
+        self.h = GLYPH
+        self.chars = chars
+        self.max = 10 ** chars - 1   # largest number that fits
+        self.color = color
+        self.value = None
+        self.changes = 0             # bumps on every re-render; use as a dirty tag
+        self.fb = FrameBuffer(bytearray(self.w * self.h * 2), self.w, self.h, RGB565)
+        self.fb.fill(key)
+        self.fb.text(label, 0, 0, color)
+
+class Hud:
+    """Text fields rendered into small RGB565 buffers and blitted with a
+    transparent key, so an unchanged field costs one blit per frame.
+
+    Integer values are composed from pre-rendered digit glyphs (one 8x80
+    strip per color, sliced into ten views), so number updates never build
+    strings. Other values are rasterized with text() when they change.
+    The key color must differ from every field color. With blit=False
+    (display cannot blit) fields are drawn with display.text() instead.
+    """
+
+    def __init__(self, key=0, blit=True):
+        self.key = key
+        self.blit = blit
+        self.fields = []
+        self.strips = {}   # color -> ten digit FrameBuffers
+
+    def _digits(self, color):
+        strip = self.strips.get(color)
+        if strip is None:
+            size = GLYPH * GLYPH * 2
+            buf = bytearray(size * 10)
+            fb = FrameBuffer(buf, GLYPH, GLYPH * 10, RGB565)
+            fb.fill(self.key)
+            for d in range(10):
+                fb.text("0123456789"[d], 0, GLYPH * d, color)
+            mv = memoryview(buf)
+            strip = [FrameBuffer(mv[size * d:size * (d + 1)], GLYPH, GLYPH, RGB565)
+                     for d in range(10)]
+            self.strips[color] = strip
+        return strip
+
+    def add(self, x, y, label, chars, color):
+        """New field with room for `chars` value characters; returns its index"""
+        self._digits(color)
+        self.fields.append(Field(x, y, label, chars, color, self.key))
+        return len(self.fields) - 1
+
+    def set(self, i, value):
+        """Update a field; re-renders and returns True only if it changed"""
+        f = self.fields[i]
+        if value == f.value:
+            return False
+        f.value = value
+        f.changes += 1
+        fb, x0 = f.fb, f.label_w
+        fb.fill_rect(x0, 0, f.w - x0, f.h, self.key)
+        if isinstance(value, int):
+            if value < 0: value = 0
+            if value > f.max: value = f.max
+            strip = self.strips[f.color]
+            # left-aligned: find the last digit's cell, then fill right to left
+            x, v = x0, value
+            while v >= 10:
+                v //= 10
+                x += GLYPH
+            while True:
+                fb.blit(strip[value % 10], x, 0)
+                value //= 10
+                if not value:
+                    break
+                x -= GLYPH
+        else:
+            fb.text(str(value)[:f.chars], x0, 0, f.color)
+        return True
+
+    def draw(self, display, i):
+        f = self.fields[i]
+        if self.blit:
+            display.blit(f.fb, f.x, f.y, self.key)
+        else:
+            display.text(f.label + str(f.value), f.x, f.y, f.color)
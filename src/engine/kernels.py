@@ -0,0 +1,143 @@
+"""Hot inner loops over typed buffers, compiled natively on the watch.
+
+Every kernel here is plain Python and works on any interpreter. On
+MicroPython the same kernels from kernels_native (decorated with
+@micropython.native or @micropython.viper) replace them at import time;
+EMITTER says which set is active and PYTHON keeps the plain versions for
+parity checks and benchmarks (tools/bench_kernels.py).
+
+Viper functions take at most four arguments, so kernels with more inputs
+read their scalars from a small array("h") of parameters.
+"""
+
+# ---------- asteroid shading ----------
+TAB_STRIDE = 7   # per candidate pixel: index, dx, dy, ring, rq, aq, rl
+SHADE_HDR = 8    # params: n, base_q, shift, margin, lxq, lyq, angle mask, unused
+
+def shade_fixed(tab, bump, sh, p):
+    """Integer pass of the asteroid shader.
+
+    Writes shade + 1 into sh for every candidate pixel whose outline and
+    lighting tests are decided by the fixed-point maths. Candidates within
+    the rounding margin are left alone; their indices are stored in
+    p[SHADE_HDR:] and their count returned, to be resolved with floats.
+    """
+    n, base_q, shift, margin, lxq, lyq, mask = p[0], p[1], p[2], p[3], p[4], p[5], p[6]
+    amb = 0
+    o = 0
+    for j in range(n):
+        dx = tab[o + 1]
+        dy = tab[o + 2]
+        if tab[o + 3]:
+            v = tab[o + 4] - base_q - bump[(tab[o + 5] + shift) & mask]
+            if v > margin:
+                o += TAB_STRIDE
+                continue
+            if v >= -margin:
+                p[SHADE_HDR + amb] = j
+                amb += 1
+                o += TAB_STRIDE
+                continue
+        # lambert >= k/4  <=>  4 * (n . -l) >= k * (r + 1e-6)
+        d4 = -4 * (dx * lxq + dy * lyq)
+        t = tab[o + 6]
+        m = 2 * ((dx if dx > 0 else -dx) + (dy if dy > 0 else -dy)) + 4
+        shade = 0
+        k = 1
+        while k <= 3:
+            v = d4 - k * t
+            if v > m:
+                shade = k
+            elif v < -m:
+                break
+            else:
+                shade = -1
+                break
+            k += 1
+        if shade < 0:
+            p[SHADE_HDR + amb] = j
+            amb += 1
+        else:
+            sh[tab[o]] = shade + 1
+        o += TAB_STRIDE
+    return amb
+
+def darken_circle(sh, w, h, c):
+    """Lower shades inside circle c = (cx, cy, rad, deep), never below 1"""
+    ccx, ccy, rad, deep = c[0], c[1], c[2], c[3]
+    r2 = rad * rad
+    y0 = ccy - rad if ccy > rad else 0
+    y1 = ccy + rad + 1 if ccy + rad + 1 < h else h
+    x0 = ccx - rad if ccx > rad else 0
+    x1 = ccx + rad + 1 if ccx + rad + 1 < w else w
+    for yy in range(y0, y1):
+        row = yy * w
+        dy2 = (yy - ccy) * (yy - ccy)
+        for xx in range(x0, x1):
+            if (xx - ccx) * (xx - ccx) + dy2 <= r2:
+                s = sh[row + xx]
+                if s:
+                    s -= deep
+                    sh[row + xx] = s if s > 1 else 1
+
+# ---------- 4-bit sprites ----------
+def pack_gs4(src, dst, w, h):
+    """Shade indices -> GS4_HMSB bytes (left pixel in the high nibble)"""
+    half = ((w + 1) & ~1) >> 1
+    for y in range(h):
+        s, d = y * w, y * half
+        x = 0
+        while x < w - 1:
+            dst[d + (x >> 1)] = (src[s + x] << 4) | src[s + x + 1]
+            x += 2
+        if w & 1:
+            dst[d + half - 1] = src[s + w - 1] << 4
+
+def unpack_gs4(src, dst, w, h):
+    """GS4_HMSB bytes -> shade indices, the inverse of pack_gs4"""
+    half = ((w + 1) & ~1) >> 1
+    for y in range(h):
+        s, d = y * half, y * w
+        for x in range(w):
+            v = src[s + (x >> 1)]
+            dst[d + x] = (v & 0x0F) if x & 1 else (v >> 4)
+
+def gs4_mask(src, mask, w, h):
+    """OR the opaque (non-zero) pixels of a GS4_HMSB sprite into a packed
+    1-bit mask, (w + 7) // 8 bytes per row, MSB = leftmost pixel"""
+    stride = (w + 7) >> 3
+    half = ((w + 1) & ~1) >> 1
+    for y in range(h):
+        row, s = y * stride, y * half
+        for x in range(w):
+            v = src[s + (x >> 1)]
+            if (v & 0x0F) if x & 1 else (v >> 4):
+                mask[row + (x >> 3)] |= 0x80 >> (x & 7)
+
+# ---------- entities ----------
+def aabb(ax1, ay1, ax2, ay2, bx1, by1, bx2, by2):
+    return not (ax2 < bx1 or ax1 > bx2 or ay2 < by1 or ay1 > by2)
+
+def advance(xs, vs, n, dt):
+    """xs[i] += vs[i] * dt for the first n entries"""
+    for i in range(n):
+        xs[i] += vs[i] * dt
+
+def translate(xs, n, d):
+    """xs[i] += d for the first n entries"""
+    for i in range(n):
+        xs[i] += d
+
+PYTHON = {
+    "shade_fixed": shade_fixed, "darken_circle": darken_circle,
+    "pack_gs4": pack_gs4, "unpack_gs4": unpack_gs4, "gs4_mask": gs4_mask,
+    "aabb": aabb, "advance": advance, "translate": translate,
+}
+
+EMITTER = "python"
+try:
+    from engine.kernels_native import (shade_fixed, darken_circle, pack_gs4,
+                                       unpack_gs4, gs4_mask, aabb, advance, translate)
+    EMITTER = "native"
+except (ImportError, SyntaxError):
+    pass   # no micropython module, or a port built without the emitters
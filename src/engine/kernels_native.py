@@ -0,0 +1,160 @@
+"""MicroPython-only builds of the engine.kernels loops (see that module).
+
+Integer kernels use the viper emitter: buffers are raw pointers and
+arithmetic is on machine words, so 16-bit loads are sign-extended by hand.
+Kernels on float arrays use the native emitter with the Python bodies
+unchanged. Importing this module fails on other interpreters.
+
+The table layout constants come from engine.kernels (which imports this
+module after defining them) and are read into viper locals once per call.
+"""
+import micropython
+from engine.kernels import TAB_STRIDE, SHADE_HDR
+
+@micropython.viper
+def shade_fixed(tab: ptr16, bump: ptr16, sh: ptr8, p: ptr16) -> int:
+    stride = int(TAB_STRIDE)
+    hdr = int(SHADE_HDR)
+    n = p[0]
+    base_q = p[1]
+    shift = p[2]
+    margin = p[3]
+    lxq = p[4]
+    if lxq > 32767: lxq -= 65536
+    lyq = p[5]
+    if lyq > 32767: lyq -= 65536
+    mask = p[6]
+    amb = 0
+    o = 0
+    for j in range(n):
+        dx = tab[o + 1]
+        if dx > 32767: dx -= 65536
+        dy = tab[o + 2]
+        if dy > 32767: dy -= 65536
+        if tab[o + 3]:
+            b = bump[(tab[o + 5] + shift) & mask]
+            if b > 32767: b -= 65536
+            v = tab[o + 4] - base_q - b
+            if v > margin:
+                o += stride
+                continue
+            if v >= -margin:
+                p[hdr + amb] = j
+                amb += 1
+                o += stride
+                continue
+        d4 = -4 * (dx * lxq + dy * lyq)
+        t = tab[o + 6]
+        ax = dx
+        if ax < 0: ax = -ax
+        ay = dy
+        if ay < 0: ay = -ay
+        m = 2 * (ax + ay) + 4
+        shade = 0
+        k = 1
+        while k <= 3:
+            v = d4 - k * t
+            if v > m:
+                shade = k
+            elif v < -m:
+                break
+            else:
+                shade = -1
+                break
+            k += 1
+        if shade < 0:
+            p[hdr + amb] = j
+            amb += 1
+        else:
+            sh[tab[o]] = shade + 1
+        o += stride
+    return amb
+
+@micropython.viper
+def darken_circle(sh: ptr8, w: int, h: int, c: ptr16):
+    ccx = c[0]
+    if ccx > 32767: ccx -= 65536
+    ccy = c[1]
+    if ccy > 32767: ccy -= 65536
+    rad = c[2]
+    deep = c[3]
+    r2 = rad * rad
+    y0 = ccy - rad
+    if y0 < 0: y0 = 0
+    y1 = ccy + rad + 1
+    if y1 > h: y1 = h
+    x0 = ccx - rad
+    if x0 < 0: x0 = 0
+    x1 = ccx + rad + 1
+    if x1 > w: x1 = w
+    yy = y0
+    while yy < y1:
+        row = yy * w
+        dy2 = (yy - ccy) * (yy - ccy)
+        xx = x0
+        while xx < x1:
+            if (xx - ccx) * (xx - ccx) + dy2 <= r2:
+                s = sh[row + xx]
+                if s:
+                    s -= deep
+                    if s < 1: s = 1
+                    sh[row + xx] = s
+            xx += 1
+        yy += 1
+
+@micropython.viper
+def pack_gs4(src: ptr8, dst: ptr8, w: int, h: int):
+    half = (w + 1) >> 1
+    for y in range(h):
+        s = y * w
+        d = y * half
+        x = 0
+        while x < w - 1:
+            dst[d + (x >> 1)] = (src[s + x] << 4) | src[s + x + 1]
+            x += 2
+        if w & 1:
+            dst[d + half - 1] = src[s + w - 1] << 4
+
+@micropython.viper
+def unpack_gs4(src: ptr8, dst: ptr8, w: int, h: int):
+    half = (w + 1) >> 1
+    for y in range(h):
+        s = y * half
+        d = y * w
+        for x in range(w):
+            v = src[s + (x >> 1)]
+            if x & 1:
+                dst[d + x] = v & 0x0F
+            else:
+                dst[d + x] = v >> 4
+
+@micropython.viper
+def gs4_mask(src: ptr8, mask: ptr8, w: int, h: int):
+    stride = (w + 7) >> 3
+    half = (w + 1) >> 1
+    for y in range(h):
+        row = y * stride
+        s = y * half
+        for x in range(w):
+            v = src[s + (x >> 1)]
+            if x & 1:
+                v &= 0x0F
+            else:
+                v >>= 4
+            if v:
+                i = row + (x >> 3)
+                mask[i] = mask[i] | (0x80 >> (x & 7))
+
+@micropython.native
+def aabb(ax1, ay1, ax2, ay2, bx1, by1, bx2, by2):
+    return not (ax2 < bx1 or ax1 > bx2 or ay2 < by1 or ay1 > by2)
+
+@micropython.native
+def advance(xs, vs, n, dt):
+    for i in range(n):
+        xs[i] += vs[i] * dt
+
+@micropython.native
+def translate(xs, n, d):
+    for i in range(n):
+        xs[i] += d
@@ -0,0 +1,94 @@
+"""Fixed-timestep game loop with frame pacing and an overload governor."""
+import time
+
+class GameLoop:
+    """Runs the simulation in fixed steps from an accumulator and renders at
+    most once per frame.
+
+    - step(dt) always gets the same dt, so physics does not depend on
+      frame rate.
+    - The loop sleeps only for what is left of the frame budget.
+    - When it falls behind it runs up to max_steps updates per frame and
+      skips rendering (at most max_skip frames in a row) to catch up. Any
+      time beyond max_steps is dropped rather than stretching the
+      simulation.
+
+    fps and slow_frames (frames whose work overran the budget) are kept up
+    to date for telemetry.
+
+    feed(elapsed_ms), if given, sees every frame's elapsed time and returns
+    the time to simulate instead (record/replay). With pace = False the loop
+    never sleeps. idle(spare_ms), if given, runs before the sleep whenever
+    the frame finished early, for background work such as prefetching.
+    """
+
+    def __init__(self, step_ms=16, frame_ms=16, max_steps=4, max_skip=2):
+        self.step_ms = step_ms
+        self.dt = step_ms / 1000.0
+        self.frame_ms = frame_ms
+        self.max_steps = max_steps
+        self.max_skip = max_skip
+        self.fps = 0.0
+        self.slow_frames = 0
+        self.skipped_renders = 0
+        self.frames = 0          # loop iterations so far
+        self.work_ms = 0         # work time of the last frame
+        self.running = False
+        self.pace = True
+
+    def stop(self):
+        self.running = False
+
+    def run(self, step, render, poll=None, max_frames=None, feed=None, idle=None):
+        ticks_ms, ticks_diff, sleep_ms = time.ticks_ms, time.ticks_diff, time.sleep_ms
+        step_ms, frame_ms = self.step_ms, self.frame_ms
+        acc = 0
+        skipped = 0
+        last = ticks_ms()
+        fps_start, fps_count = last, 0
+        self.running = True
+        while self.running:
+            start = ticks_ms()
+            elapsed = ticks_diff(start, last)
+            last = start
+            if feed is not None:
+                elapsed = feed(elapsed)
+            acc += elapsed
+            if poll is not None:
+                poll()
+
+            steps = 0
+            while acc >= step_ms:
+                step(self.dt)
+                acc -= step_ms
+                steps += 1
+                if steps >= self.max_steps:
+                    acc = 0  # hopelessly behind: drop the backlog
+                    break
+
+            if steps > 1 and skipped < self.max_skip:
+                skipped += 1  # overloaded: give the time to the simulation
+                self.skipped_renders += 1
+            else:
+                skipped = 0
+                render()
+                fps_count += 1
+
+            self.frames += 1
+            now = ticks_ms()
+            work = ticks_diff(now, start)
+            self.work_ms = work
+            if work > frame_ms:
+                self.slow_frames += 1
+            elapsed = ticks_diff(now, fps_start)
+            if elapsed >= 1000:
+                self.fps = fps_count * 1000 / elapsed
+                fps_start, fps_count = now, 0
+            if max_frames is not None and self.frames >= max_frames:
+                break
+            if idle is not None and work < frame_ms:
+                idle(frame_ms - work)
+                work = ticks_diff(ticks_ms(), start)
+            if work < frame_ms and self.pace:
+                sleep_ms(frame_ms - work)
+        self.running = False
@@ -0,0 +1,170 @@
+"""Procedural RGB565 sprite generators (no display dependency)."""
+import math
+from array import array
+from engine.colors import rgb565
+from engine.kernels import TAB_STRIDE, SHADE_HDR, shade_fixed, darken_circle, pack_gs4, unpack_gs4
+
+# Bump whenever a generator below changes its output; cached atlases
+# built by an older generator are then treated as stale.
+GENERATOR_VERSION = 1
+
+# 4 brown/gray asteroid shades (dark -> light)
+ASTEROID_PALETTE = (
+    rgb565(40, 30, 25),    # darkest brown
+    rgb565(70, 50, 40),    # dark brown
+    rgb565(100, 70, 55),   # mid brown
+    rgb565(130, 95, 75)    # light brown highlight
+)
+
+
+# ---------- polar lookup tables ----------
+# Radius and base angle of a pixel do not change between rotation frames,
+# only the angle offset does. They are tabulated once per sprite size and
+# every frame is then emitted with integer lookups. Pixels whose fixed-point
+# result lands within the rounding margin of a threshold are resolved with
+# the exact float maths, so the output matches the float generator byte for
+# byte.
+ANGLE_STEPS = 1024          # quantized angles per turn (power of two)
+_ANGLE_STEP = 2 * math.pi / ANGLE_STEPS
+_RQ = 256                   # fixed point scale for radius and bumps
+_LQ = 1024                  # fixed point scale for the light vector
+_BUMP_SLOPE = 0.8 * 7 + 0.5 * 11   # max |d irregular / d angle|
+
+def _irregular(ang):
+    return 0.8 * math.sin(7*ang) + 0.5 * math.sin(11*ang + 2.1)
+
+# Both surface harmonics (sin(7a) and sin(11a + 2.1)) per quantized angle
+BUMP_TABLE = array("h", [int(round(_irregular(i * _ANGLE_STEP) * _RQ))
+                         for i in range(ANGLE_STEPS)])
+
+# Worst case |table - exact| in _RQ units: pixel angle and rotation offset
+# are each rounded by up to half a step, plus the two fixed-point roundings
+_BUMP_MARGIN = int(_BUMP_SLOPE * _ANGLE_STEP * _RQ) + 3
+
+# Craters as (dx, dy, radius, depth) relative to the asteroid centre
+ASTEROID_CRATERS = ((-4, -3, 3, 2), (3, -1, 2, 1), (-1, 4, 2, 2))
+
+def _exact_shade(dx, dy, lx, ly):
+    r = math.sqrt(dx*dx + dy*dy)
+    nx, ny = (dx / (r + 1e-6)), (dy / (r + 1e-6))
+    lambert = max(0.0, -(nx*lx + ny*ly))  # 0..1
+    if lambert < 0.25: return 0
+    elif lambert < 0.50: return 1
+    elif lambert < 0.75: return 2
+    return 3
+
+def gs4_stride(w):
+    """GS4_HMSB row stride in pixels: rows start on a whole byte"""
+    return (w + 1) & ~1
+
+def encode_gs4(shades, w, h):
+    """Shade indices -> GS4_HMSB bytes (left pixel in the high nibble)"""
+    data = bytearray((gs4_stride(w) >> 1) * h)
+    pack_gs4(shades, data, w, h)
+    return data
+
+def decode_gs4(data, w, h):
+    """GS4_HMSB bytes -> shade indices, the inverse of encode_gs4"""
+    sh = bytearray(w * h)
+    unpack_gs4(data, sh, w, h)
+    return sh
+
+def encode_rgb565(shades, palette=ASTEROID_PALETTE):
+    """Shade indices (0 = transparent, k = palette[k-1]) -> RGB565 bytes"""
+    hi = bytes([0] + [c >> 8 for c in palette])
+    lo = bytes([0] + [c & 0xFF for c in palette])
+    data = bytearray(2 * len(shades))
+    i = 0
+    for s in shades:
+        if s:
+            data[i] = hi[s]
+            data[i + 1] = lo[s]
+        i += 2
+    return data
+
+class AsteroidGenerator:
+    """Polar tables for one asteroid size, shared by all its rotation frames"""
+
+    def __init__(self, w, h):
+        self.w, self.h = w, h
+        cx, cy = w // 2, h // 2
+        self.cx, self.cy = cx, cy
+        self.base_r = min(w, h) // 2 - 2
+        base_q = self.base_r * _RQ
+        inner = base_q + min(BUMP_TABLE) - _BUMP_MARGIN
+        outer = base_q + max(BUMP_TABLE) + _BUMP_MARGIN
+
+        # Candidate pixels (possibly inside for some rotation), TAB_STRIDE
+        # entries each: pixel index, dx, dy, ring (1 = outline depends on
+        # the rotation), radius (_RQ fixed point), base angle index into
+        # BUMP_TABLE and (r + 1e-6) in _LQ fixed point. All fit 16 bits for
+        # sprites up to ~40 px.
+        tab = array("h")
+        for y in range(h):
+            for x in range(w):
+                dx, dy = x - cx, y - cy
+                r = math.sqrt(dx*dx + dy*dy)
+                rq = int(round(r * _RQ))
+                if rq > outer:
+                    continue
+                tab.append(y * w + x)
+                tab.append(dx)
+                tab.append(dy)
+                tab.append(1 if rq >= inner else 0)
+                tab.append(rq)
+                tab.append(int(round(math.atan2(dy, dx) / _ANGLE_STEP)) & (ANGLE_STEPS - 1))
+                tab.append(int(round((r + 1e-6) * _LQ)))
+        self.tab = tab
+        n = len(tab) // TAB_STRIDE
+        # shade_fixed parameters, then room for every candidate's index
+        self.params = array("h", [0] * (SHADE_HDR + n))
+        p = self.params
+        p[0], p[1], p[3], p[6] = n, base_q, _BUMP_MARGIN, ANGLE_STEPS - 1
+        self.crater = array("h", [0] * 4)
+
+        # Crater polar positions, rotated per frame
+        self.craters = [(math.atan2(ody, odx), math.sqrt(odx**2 + ody**2), odx, ody, rad, deep)
+                        for odx, ody, rad, deep in ASTEROID_CRATERS]
+
+    def shades(self, rotation_offset=0, rotate_craters=True):
+        """Shade index per pixel: 0 = transparent, k = palette entry k-1"""
+        w, h, base_r = self.w, self.h, self.base_r
+        sh = bytearray(w * h)
+
+        # fake lighting from upper-left (rotated with the asteroid)
+        lx = -0.4 * math.cos(rotation_offset) - 0.9 * math.sin(rotation_offset)
+        ly = 0.4 * math.sin(rotation_offset) - 0.9 * math.cos(rotation_offset)
+
+        # integer pass, then exact floats for pixels within the margins
+        p = self.params
+        p[2] = int(round(rotation_offset / _ANGLE_STEP))
+        p[4] = int(round(lx * _LQ))
+        p[5] = int(round(ly * _LQ))
+        tab = self.tab
+        for a in range(shade_fixed(tab, BUMP_TABLE, sh, p)):
+            o = p[SHADE_HDR + a] * TAB_STRIDE
+            dx, dy = tab[o + 1], tab[o + 2]
+            if tab[o + 3]:
+                r = math.sqrt(dx*dx + dy*dy)
+                if not r <= base_r + _irregular(math.atan2(dy, dx) + rotation_offset):
+                    continue
+            sh[tab[o]] = _exact_shade(dx, dy, lx, ly) + 1
+
+        cx, cy, c = self.cx, self.cy, self.crater
+        for ang0, dist, odx, ody, rad, deep in self.craters:
+            if rotate_craters:
+                ang = ang0 + rotation_offset
+                ccx = int(cx + dist * math.cos(ang))
+                ccy = int(cy + dist * math.sin(ang))
+            else:
+                ccx, ccy = cx + odx, cy + ody
+            c[0], c[1], c[2], c[3] = ccx, ccy, rad, deep
+            darken_circle(sh, w, h, c)
+        return sh
+
+    def pixels(self, rotation_offset=0, rotate_craters=True, palette=ASTEROID_PALETTE):
+        return encode_rgb565(self.shades(rotation_offset, rotate_craters), palette)
+
+    def indexed(self, rotation_offset=0, rotate_craters=True):
+        """4-bit GS4_HMSB frame; blit through a palette with entry 0 = key"""
+        return encode_gs4(self.shades(rotation_offset, rotate_craters), self.w, self.h)
@@ -0,0 +1,114 @@
+"""Per-phase frame profiler with rolling stats and a bar overlay."""
+import time
+from array import array
+
+class Profiler:
+    """Splits each frame into named phases timed with ticks_us.
+
+    Per frame:
+        p.frame()        # once, at the start of the frame
+        p.lap(PHASE)     # at the end of each phase; time since the previous
+                         # lap (or frame()/mark()) is charged to PHASE
+        p.mark()         # where a phase starts after idle time (e.g. a task
+                         # waking up), so the gap is not charged
+    Phases may lap several times per frame (e.g. repeated simulation steps);
+    their times add up. Time between the last lap and the next frame()
+    (the loop's sleep) is not charged to anything.
+
+    Per-phase totals of the last `window` frames are kept in one
+    preallocated ring, so recording never allocates. stats() gives
+    min/avg/p95/max, dump() prints them, draw() paints the last frame as a
+    stacked bar where the full width is the frame budget.
+
+    Disabled, frame() and lap() return after a single attribute test.
+    """
+
+    def __init__(self, names, window=64, budget_us=16000):
+        self.names = names
+        self.n = len(names)
+        self.window = window
+        self.budget_us = budget_us
+        self.enabled = False
+        self.acc = array("l", [0] * self.n)     # frame in progress
+        self.last = array("l", [0] * self.n)    # last complete frame
+        self.ring = array("l", [0] * (self.n * window))  # window rows of n
+        self.pos = 0
+        self.filled = 0
+        self.t = 0
+        self.open = False   # a frame is in progress
+
+    def enable(self, on=True):
+        self.enabled = on
+        self.open = False   # never record a frame that started while off
+
+    def reset(self):
+        self.pos = 0
+        self.filled = 0
+        self.open = False
+
+    def frame(self):
+        if not self.enabled:
+            return
+        if self.open:
+            acc, last, ring = self.acc, self.last, self.ring
+            o = self.pos * self.n
+            for i in range(self.n):
+                ring[o + i] = acc[i]
+                last[i] = acc[i]
+                acc[i] = 0
+            self.pos = (self.pos + 1) % self.window
+            if self.filled < self.window:
+                self.filled += 1
+        self.open = True
+        self.t = time.ticks_us()
+
+    def mark(self):
+        if not self.enabled:
+            return
+        self.t = time.ticks_us()
+
+    def lap(self, phase):
+        if not self.enabled:
+            return
+        now = time.ticks_us()
+        self.acc[phase] += time.ticks_diff(now, self.t)
+        self.t = now
+
+    def stats(self, phase):
+        """(min, avg, p95, max) in us over the window, phase -1 = frame total"""
+        k = self.filled
+        if not k:
+            return (0, 0, 0, 0)
+        n, ring = self.n, self.ring
+        if phase < 0:
+            vals = [sum(ring[r * n:r * n + n]) for r in range(k)]
+        else:
+            vals = [ring[r * n + phase] for r in range(k)]
+        vals.sort()
+        return (vals[0], sum(vals) // k, vals[(k - 1) * 95 // 100], vals[-1])
+
+    def dump(self):
+        """Print a per-phase summary over serial"""
+        print("phase      min   avg   p95   max (us, %d frames)" % self.filled)
+        for i in range(-1, self.n):
+            mn, avg, p95, mx = self.stats(i)
+            name = self.names[i] if i >= 0 else "frame"
+            print("%-8s %5d %5d %5d %5d" % (name, mn, avg, p95, mx))
+
+    def draw(self, display, x, y, w, h, colors, mark=None):
+        """Stacked bar of the last frame; w pixels = budget_us"""
+        last, budget = self.last, self.budget_us
+        x2 = x + w
+        px = x
+        for i in range(self.n):
+            seg = last[i] * w // budget
+            if seg <= 0:
+                continue
+            if px + seg > x2:
+                seg = x2 - px
+            display.rect(px, y, seg, h, colors[i % len(colors)], True)
+            px += seg
+            if px >= x2:
+                break
+        if mark is not None:
+            display.rect(x2 - 1, y, 1, h, mark, True)
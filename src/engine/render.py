@@ -0,0 +1,235 @@
+"""Dirty-rectangle renderer: repaint and push only what changed."""
+from array import array
+
+class DirtyRenderer:
+    """Tracks every drawable's bounding box between frames and merges the
+    old and new boxes of anything that moved, changed (tag differs),
+    appeared or vanished into a few dirty rectangles.
+
+    Per frame:
+        r.begin()
+        r.mark(key, x, y, w, h, tag)   # for every drawable, stable int key
+        r.resolve()                     # clears the dirty regions
+        ... draw each drawable for which r.touches(x, y, w, h) ...
+        r.commit()
+
+    Falls back to a full-frame repaint when there are too many regions or
+    they cover most of the screen. If the display has commit_rect(x, y, w, h)
+    only the dirty regions are pushed, otherwise commit() sends the frame.
+
+    An optional background object (draw(display),
+    draw_rect(display, x, y, w, h), moved() and changes(add)) is repainted
+    under the cleared regions. With commit_rect, changes() adds the regions
+    of the background itself that changed since it was last drawn, through
+    add(x1, y1, x2, y2); without it the whole frame is pushed anyway, so a
+    background that moved() is simply repainted in full.
+    """
+
+    def __init__(self, display, w=128, h=128, max_keys=128, bg=0,
+                 max_rects=24, merge_gap=2, full_ratio=0.6):
+        self.display = display
+        self.w, self.h = w, h
+        self.bg = bg
+        self.max_keys = max_keys
+        self.max_rects = max_rects
+        self.gap = merge_gap
+        self.full_area = int(w * h * full_ratio)
+        self.partial = hasattr(display, "commit_rect")
+        self.debug = False
+        self.background = None
+
+        self.cur = array("h", [0] * (4 * max_keys))
+        self.prev = array("h", [0] * (4 * max_keys))
+        self.cur_tag = array("l", [0] * max_keys)
+        self.prev_tag = array("l", [0] * max_keys)
+        self.cur_on = bytearray(max_keys)
+        self.prev_on = bytearray(max_keys)
+
+        self.rects = array("h", [0] * (4 * max_rects))  # x1, y1, x2, y2 (exclusive)
+        self.n = 0
+        self.last = array("h", [0] * (4 * max_rects))   # previous frame, for the overlay
+        self.last_n = 0
+        self.full = True       # first frame is always a full repaint
+        self.pushed = 0        # bytes sent to the display last frame
+        self.frames = 0        # frames committed so far
+        self.full_frames = 0   # ...of which full repaints
+
+    def invalidate(self):
+        """Force a full-frame repaint on the next frame"""
+        self.full = True
+
+    def begin(self):
+        cur_on = self.cur_on
+        for k in range(self.max_keys):
+            cur_on[k] = 0
+
+    def mark(self, key, x, y, w, h, tag=0):
+        o = key * 4
+        c = self.cur
+        c[o] = int(x)
+        c[o + 1] = int(y)
+        c[o + 2] = w
+        c[o + 3] = h
+        self.cur_tag[key] = tag
+        self.cur_on[key] = 1
+
+    def _add(self, x1, y1, x2, y2):
+        if x1 < 0: x1 = 0
+        if y1 < 0: y1 = 0
+        if x2 > self.w: x2 = self.w
+        if y2 > self.h: y2 = self.h
+        if x1 >= x2 or y1 >= y2:
+            return
+        r, g = self.rects, self.gap
+        i = 0
+        while i < self.n:
+            o = i * 4
+            if x1 <= r[o + 2] + g and r[o] <= x2 + g and y1 <= r[o + 3] + g and r[o + 1] <= y2 + g:
+                # absorb rect i, drop it and rescan since the union grew
+                if r[o] < x1: x1 = r[o]
+                if r[o + 1] < y1: y1 = r[o + 1]
+                if r[o + 2] > x2: x2 = r[o + 2]
+                if r[o + 3] > y2: y2 = r[o + 3]
+                self.n -= 1
+                last = self.n * 4
+                r[o], r[o + 1], r[o + 2], r[o + 3] = r[last], r[last + 1], r[last + 2], r[last + 3]
+                i = 0
+                continue
+            i += 1
+        if self.n >= self.max_rects:
+            self.full = True
+            return
+        o = self.n * 4
+        r[o], r[o + 1], r[o + 2], r[o + 3] = x1, y1, x2, y2
+        self.n += 1
+
+    def _covered(self, x1, y1, x2, y2):
+        """0 = misses all dirty rects, 1 = partly inside one, 2 = fully inside one"""
+        r = self.rects
+        hit = 0
+        for i in range(self.n):
+            o = i * 4
+            if x1 < r[o + 2] and r[o] < x2 and y1 < r[o + 3] and r[o + 1] < y2:
+                if r[o] <= x1 and r[o + 1] <= y1 and x2 <= r[o + 2] and y2 <= r[o + 3]:
+                    return 2
+                hit = 1
+        return hit
+
+    def resolve(self):
+        """Work out this frame's dirty regions and clear them to bg"""
+        self.n = 0
+        bgl = self.background
+        if bgl is not None and not self.full:
+            if not self.partial and bgl.moved():
+                self.full = True   # the whole frame goes out anyway
+            else:
+                bgl.changes(self._add)
+        if not self.full:
+            if self.debug:
+                # erase last frame's outlines too
+                l = self.last
+                for i in range(self.last_n):
+                    o = i * 4
+                    self._add(l[o], l[o + 1], l[o + 2], l[o + 3])
+            c, p = self.cur, self.prev
+            ct, pt = self.cur_tag, self.prev_tag
+            con, pon = self.cur_on, self.prev_on
+            for k in range(self.max_keys):
+                o = k * 4
+                if con[k] and pon[k] and ct[k] == pt[k] and c[o] == p[o] and \
+                        c[o + 1] == p[o + 1] and c[o + 2] == p[o + 2] and c[o + 3] == p[o + 3]:
+                    continue
+                if pon[k]:
+                    self._add(p[o], p[o + 1], p[o] + p[o + 2], p[o + 1] + p[o + 3])
+                if con[k]:
+                    self._add(c[o], c[o + 1], c[o] + c[o + 2], c[o + 1] + c[o + 3])
+
+            # anything overlapping a dirty region gets redrawn whole, so its
+            # box must be dirty as well (repeat until nothing grows)
+            grew = True
+            while grew and not self.full:
+                grew = False
+                for k in range(self.max_keys):
+                    if con[k]:
+                        o = k * 4
+                        x1, y1 = c[o], c[o + 1]
+                        x2, y2 = x1 + c[o + 2], y1 + c[o + 3]
+                        # clip first: a clipped dirty rect can never contain an
+                        # off-screen part
+                        if x1 < 0: x1 = 0
+                        if y1 < 0: y1 = 0
+                        if x2 > self.w: x2 = self.w
+                        if y2 > self.h: y2 = self.h
+                        if x1 < x2 and y1 < y2 and self._covered(x1, y1, x2, y2) == 1:
+                            self._add(x1, y1, x2, y2)
+                            grew = True
+
+            area = 0
+            r = self.rects
+            for i in range(self.n):
+                o = i * 4
+                area += (r[o + 2] - r[o]) * (r[o + 3] - r[o + 1])
+            if area > self.full_area:
+                self.full = True
+
+        d = self.display
+        if self.full:
+            d.fill(self.bg)
+            if bgl is not None:
+                bgl.draw(d)
+        else:
+            r = self.rects
+            for i in range(self.n):
+                o = i * 4
+                x, y, w, h = r[o], r[o + 1], r[o + 2] - r[o], r[o + 3] - r[o + 1]
+                d.rect(x, y, w, h, self.bg, True)
+                if bgl is not None:
+                    bgl.draw_rect(d, x, y, w, h)
+
+    def touches(self, x, y, w, h):
+        """True if a drawable at this box must be drawn this frame"""
+        if self.full:
+            return True
+        x = int(x)
+        y = int(y)
+        return self._covered(x, y, x + w, y + h) != 0
+
+    def overlay(self, color):
+        """Debug: outline this frame's dirty regions"""
+        if self.full:
+            return
+        r = self.rects
+        for i in range(self.n):
+            o = i * 4
+            self.display.rect(r[o], r[o + 1], r[o + 2] - r[o], r[o + 3] - r[o + 1], color, False)
+
+    def commit(self):
+        d = self.display
+        self.frames += 1
+        if self.full:
+            self.full_frames += 1
+        if self.full or not self.partial:
+            d.commit()
+            self.pushed = self.w * self.h * 2
+        else:
+            pushed = 0
+            r = self.rects
+            for i in range(self.n):
+                o = i * 4
+                w, h = r[o + 2] - r[o], r[o + 3] - r[o + 1]
+                d.commit_rect(r[o], r[o + 1], w, h)
+                pushed += w * h * 2
+            self.pushed = pushed
+
+        # remember this frame for the next diff
+        if self.debug and not self.full:
+            l, r = self.last, self.rects
+            for i in range(4 * self.n):
+                l[i] = r[i]
+            self.last_n = self.n
+        else:
+            self.last_n = 0
+        self.prev, self.cur = self.cur, self.prev
+        self.prev_tag, self.cur_tag = self.cur_tag, self.prev_tag
+        self.prev_on, self.cur_on = self.cur_on, self.prev_on
+        self.full = False
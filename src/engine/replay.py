@@ -0,0 +1,156 @@
+"""Deterministic input recording and replay."""
+import random, time
+from array import array
+
+# Session file, one record per line:
+#   seed <n>                  RNG seed, first line
+#   f <elapsed_ms> <probe>    a frame: time fed to the loop, state probe at
+#                             the start of the frame
+#   e <button> <1|0>          button press/release during the frame above
+
+class Recorder:
+    """Seeds the RNG and logs every frame's elapsed time and every bound
+    button callback to a session file.
+
+    Bind callbacks through bind() and pass feed to GameLoop.run().
+    probe() should return a short string (no spaces) summarising the game
+    state, e.g. entity counts; replay compares it frame by frame. The file
+    is flushed every flush_every frames; call close() when the loop stops
+    so the last frames are not lost.
+    """
+
+    def __init__(self, path, seed=None, probe=None, flush_every=60):
+        if seed is None:
+            seed = time.ticks_us() & 0x3FFFFFFF
+        self.seed = seed
+        random.seed(seed)
+        self.probe = probe
+        self.flush_every = flush_every
+        self.frames = 0
+        self.f = open(path, "w")
+        self.f.write("seed %d\n" % seed)
+
+    def bind(self, name, pressed, cb):
+        f, state = self.f, 1 if pressed else 0
+        def recorded():
+            f.write("e %s %d\n" % (name, state))
+            cb()
+        return recorded
+
+    def feed(self, elapsed):
+        p = self.probe() if self.probe is not None else "-"
+        self.f.write("f %d %s\n" % (elapsed, p))
+        self.frames += 1
+        if self.frames % self.flush_every == 0:
+            self.f.flush()
+        return elapsed
+
+    def close(self):
+        if self.f is not None:
+            self.f.flush()
+            self.f.close()
+            self.f = None
+
+class Player:
+    """Replays a session file through the same button callbacks.
+
+    Exact mode feeds the recorded per-frame elapsed times, so the loop runs
+    the same steps and the probe must match on every frame. With fixed_ms
+    every frame advances the simulation by fixed_ms instead and events fire
+    at their recorded simulation time; pair it with GameLoop.pace = False
+    for benchmark runs as fast as the device allows.
+
+    Call poll() instead of buttons.scan(). on_end() is called once when the
+    session runs out, typically to stop the loop.
+    """
+
+    def __init__(self, path, probe=None, fixed_ms=0, on_end=None):
+        self.probe = probe
+        self.fixed_ms = fixed_ms
+        self.on_end = on_end
+        self.elapsed = array("H")
+        self.probes = []
+        self.events = []       # (frame, recorded ms at that frame, name, pressed)
+        self.cbs = {}
+        self.seed = 0
+        total = 0
+        with open(path) as f:
+            for line in f:
+                rec = line.split()
+                if not rec:
+                    continue
+                if rec[0] == "f":
+                    ms = int(rec[1])
+                    self.elapsed.append(ms)
+                    self.probes.append(rec[2])
+                    total += ms
+                elif rec[0] == "e":
+                    self.events.append((len(self.elapsed) - 1, total, rec[1], rec[2] == "1"))
+                elif rec[0] == "seed":
+                    self.seed = int(rec[1])
+        self.total = total
+        random.seed(self.seed)
+        self.frame = 0         # frames fed so far
+        self.sim = 0           # simulated ms so far (fixed mode)
+        self.next = 0          # next event
+        self.mismatches = 0
+        self.first_mismatch = -1
+        self.done = False
+        self.t0 = None
+        self.wall_ms = 0
+
+    def bind(self, name, pressed, cb):
+        self.cbs[(name, pressed)] = cb
+        return cb
+
+    def feed(self, elapsed):
+        now = time.ticks_ms()
+        if self.t0 is None:
+            self.t0 = now
+        if self.done:
+            return 0
+        k = self.frame
+        if self.fixed_ms:
+            if self.sim >= self.total:
+                return self._end(now)
+            self.sim += self.fixed_ms
+            self.frame = k + 1
+            return self.fixed_ms
+        if k >= len(self.elapsed):
+            return self._end(now)
+        if self.probe is not None and self.probe() != self.probes[k]:
+            self.mismatches += 1
+            if self.first_mismatch < 0:
+                self.first_mismatch = k
+        self.frame = k + 1
+        return self.elapsed[k]
+
+    def poll(self):
+        """Fire this frame's recorded button events"""
+        ev, cbs = self.events, self.cbs
+        cur = self.frame - 1
+        while self.next < len(ev):
+            frame, at, name, pressed = ev[self.next]
+            if (at > self.sim) if self.fixed_ms else (frame > cur):
+                break
+            self.next += 1
+            cb = cbs.get((name, pressed))
+            if cb is not None:
+                cb()
+
+    def _end(self, now):
+        self.done = True
+        self.wall_ms = time.ticks_diff(now, self.t0)
+        if self.on_end is not None:
+            self.on_end()
+        return 0
+
+    def report(self):
+        print("replay: %d frames in %d ms (%s)" % (
+            self.frame, self.wall_ms, "fixed %d ms" % self.fixed_ms if self.fixed_ms else "exact"))
+        if not self.fixed_ms and self.probe is not None:
+            if self.mismatches:
+                print("replay: %d frames diverged, first at frame %d" % (
+                    self.mismatches, self.first_mismatch))
+            else:
+                print("replay: state matched on every frame")
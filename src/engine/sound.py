@@ -0,0 +1,80 @@
+"""Non-blocking piezo sound sequencer."""
+
+class Sequencer:
+    """Plays effects given as tuples of (freq, ms) steps, advanced by
+    update(dt_ms) once per frame instead of sleeping between tones.
+    freq 0 is a rest.
+
+    Priority rules: an effect with a higher priority than the one playing
+    preempts it immediately; anything else waits in a small voice queue
+    (highest priority first, then oldest) and is dropped when the queue is
+    full.
+    """
+
+    def __init__(self, tone, queue_len=4):
+        self.tone = tone            # callable(freq, ms), e.g. piezo.tone
+        self.queue_len = queue_len
+        self.queue = []             # pending (priority, effect)
+        self.effect = None
+        self.priority = 0
+        self.step = 0
+        self.left = 0               # ms until the current step ends
+
+    def busy(self):
+        return self.effect is not None
+
+    def play(self, effect, priority=0):
+        if self.effect is None or priority > self.priority:
+            self._start(effect, priority)
+            return True
+        if len(self.queue) >= self.queue_len:
+            return False
+        n = 0
+        while n < len(self.queue) and self.queue[n][0] >= priority:
+            n += 1
+        self.queue.insert(n, (priority, effect))
+        return True
+
+    def cue(self, effect, priority=0):
+        """Zero-argument callable that plays effect, for game events"""
+        return lambda: self.play(effect, priority)
+
+    def stop(self):
+        self.effect = None
+        del self.queue[:]
+
+    def update(self, dt_ms):
+        """Advance by dt_ms; steps shorter than a frame are skipped over"""
+        if self.effect is None:
+            return
+        self.left -= dt_ms
+        if self.left > 0:
+            return  # current tone still sounding
+        effect = self.effect
+        while self.left <= 0:
+            self.step += 1
+            if self.step >= len(effect):
+                late = -self.left
+                self.effect = None
+                if self.queue:
+                    priority, effect = self.queue.pop(0)
+                    self._start(effect, priority, late)
+                return
+            self.left += effect[self.step][1]
+        self._emit(effect[self.step][0], self.left)
+
+    def _start(self, effect, priority, late_ms=0):
+        self.effect = effect
+        self.priority = priority
+        self.step = 0
+        self.left = effect[0][1] - late_ms
+        if self.left > 0:
+            self._emit(effect[0][0], self.left)
+        else:
+            self.update(0)
+
+    def _emit(self, freq, ms):
+        if freq <= 0:
+            return
+        try: self.tone(freq, ms)
+        except: pass
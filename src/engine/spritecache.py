@@ -0,0 +1,84 @@
+"""Byte-budgeted LRU cache for sprites loaded or generated on demand."""
+
+class SpriteCache:
+    """Maps integer keys to sprites built by load(key) -> (item, nbytes).
+
+    Items are created on first get(). When the bytes held would exceed
+    budget the least recently used items are dropped (never the one just
+    loaded), so memory stays capped however many sprites exist.
+
+    want(key) queues a key for prefetch(), which loads queued items in
+    spare frame time so a later get() hits. hits/misses/evictions/
+    prefetches count what happened.
+    """
+
+    def __init__(self, load, budget, queue_len=8):
+        self.load = load
+        self.budget = budget
+        self.queue_len = queue_len
+        self.items = {}
+        self.sizes = {}
+        self.used_at = {}     # key -> clock value of the last use
+        self.clock = 0
+        self.used = 0         # bytes held
+        self.wanted = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prefetches = 0
+
+    def get(self, key):
+        self.clock += 1
+        item = self.items.get(key)
+        if item is not None:
+            self.hits += 1
+            self.used_at[key] = self.clock
+            return item
+        self.misses += 1
+        return self._insert(key)
+
+    def want(self, key):
+        if key not in self.items and key not in self.wanted and len(self.wanted) < self.queue_len:
+            self.wanted.append(key)
+
+    def prefetch(self, limit=1):
+        """Load up to limit queued items; returns how many were loaded"""
+        n = 0
+        while self.wanted and n < limit:
+            key = self.wanted.pop(0)
+            if key not in self.items:
+                self.clock += 1
+                self._insert(key)
+                self.prefetches += 1
+                n += 1
+        return n
+
+    def clear(self):
+        self.items.clear()
+        self.sizes.clear()
+        self.used_at.clear()
+        del self.wanted[:]
+        self.used = 0
+
+    def _insert(self, key):
+        item, nbytes = self.load(key)
+        used_at = self.used_at
+        while used_at and self.used + nbytes > self.budget:
+            oldest = None
+            for k in used_at:
+                if oldest is None or used_at[k] < used_at[oldest]:
+                    oldest = k
+            del self.items[oldest]
+            del used_at[oldest]
+            self.used -= self.sizes.pop(oldest)
+            self.evictions += 1
+        self.items[key] = item
+        self.sizes[key] = nbytes
+        used_at[key] = self.clock
+        self.used += nbytes
+        return item
+
+    def stats(self):
+        return "%d items, %d/%d bytes, %d hits, %d misses, %d evictions, %d prefetched" % (
+            len(self.items), self.used, self.budget, self.hits, self.misses,
+            self.evictions, self.prefetches)
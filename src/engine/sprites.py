@@ -0,0 +1,69 @@
+"""Animated 4-bit sprites loaded on demand, with masks and color variants."""
+from framebuf import FrameBuffer, RGB565, GS4_HMSB
+from engine.spritecache import SpriteCache
+from engine.collide import indexed_mask
+from engine.procgen import gs4_stride, decode_gs4, encode_rgb565
+from engine.bitmap import make_palette
+
+class SpriteManager:
+    """`types` sprite types of `frames` animation frames each, stored as
+    4-bit palette indices (GS4_HMSB, index 0 transparent).
+
+    source.size(t) gives (w, h) and source.frame(t, n) gives (w, h, data);
+    frames are loaded on first use into a byte-budgeted SpriteCache along
+    with a packed 1-bit opacity mask for pixel-accurate collisions.
+
+    Each entry of palettes (colors for indices 1..) is a color variant,
+    applied at blit time. Without palette_blit (display cannot blit through
+    a palette) frames are expanded to RGB565 in the first palette instead:
+    4x the RAM and no variants. Without blit at all only the masks are
+    cached (get() returns (None, mask)) and draw() must not be used.
+    """
+
+    def __init__(self, source, types, frames, palettes, budget, palette_blit=True, key=0,
+                 blit=True):
+        self.source = source
+        self.frames = frames
+        self.key = key
+        self.blit = blit
+        self.palette_blit = palette_blit
+        self.sizes = [source.size(t) for t in range(types)]
+        self.colors = palettes[0]
+        self.palettes = [make_palette(p, key) for p in palettes] if palette_blit else [None]
+        self.cache = SpriteCache(self._load, budget)
+
+    def _load(self, k):
+        t, n = divmod(k, self.frames)
+        w, h, data = self.source.frame(t, n)
+        mask = indexed_mask(data, w, h)
+        if not self.blit:
+            return (None, mask), len(mask)
+        if self.palette_blit:
+            fb = FrameBuffer(data, w, h, GS4_HMSB, gs4_stride(w))
+            size = len(data)
+        else:
+            fb = FrameBuffer(encode_rgb565(decode_gs4(data, w, h), self.colors), w, h, RGB565)
+            size = w * h * 2
+        return (fb, mask), size + len(mask)
+
+    def get(self, t, n):
+        """(FrameBuffer, mask) of frame n of type t"""
+        return self.cache.get(t * self.frames + n)
+
+    def want(self, t, n):
+        """Queue a frame for prefetch()"""
+        self.cache.want(t * self.frames + n)
+
+    def prefetch(self, limit=1):
+        return self.cache.prefetch(limit)
+
+    def draw(self, display, t, n, x, y, variant=0):
+        fb = self.cache.get(t * self.frames + n)[0]
+        pal = self.palettes[variant] if variant < len(self.palettes) else None
+        if pal is None:
+            display.blit(fb, int(x), int(y), self.key)
+        else:
+            display.blit(fb, int(x), int(y), self.key, pal)
+
+    def stats(self):
+        return self.cache.stats()
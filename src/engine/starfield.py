@@ -0,0 +1,193 @@
+"""Pre-rendered parallax starfield with wrap-around scrolling."""
+import random
+from array import array
+from framebuf import FrameBuffer, MONO_HLSB, RGB565
+
+class Starfield:
+    """One 1-bit strip per parallax speed, scrolled right-to-left.
+
+    Each strip is wider than the screen; columns that scroll off the left
+    edge cross the hidden margin and are reseeded just before they come
+    back on the right, so the field never repeats. A column holds at most
+    one star, so the per-frame cost (two blits per layer plus a reseed per
+    crossed column) does not depend on star density.
+
+    As the background of a DirtyRenderer, moved() says whether anything
+    scrolled since the last draw and changes(add) reports where, as at most
+    one region per band of `band` rows per layer; draw_rect() repaints a
+    region with a few blits per layer whatever the number of stars in it.
+
+    layers: sequence of (speed px/s, color, stars on screen). Only the
+    first `active` layers are scrolled and drawn (set_active()).
+    """
+
+    def __init__(self, w, h, layers, margin=32, band=8):
+        self.w, self.h = w, h
+        self.band = band
+        self.sw = (w + margin + 7) & ~7   # strip width, whole bytes per row
+        self.speed = []
+        self.color = []
+        self.chance = []     # probability that a reseeded column gets a star
+        self.offset = []     # float scroll position in strip columns
+        self.shown = []      # integer offset on screen
+        self.drawn = []      # offset the display was last painted at
+        self.col_y = []      # star row per strip column, -1 = empty
+        self.strip = []
+        self.palette = []
+        for speed, color, count in layers:
+            buf = bytearray(self.sw * h // 8)
+            pal = FrameBuffer(bytearray(4), 2, 1, RGB565)
+            pal.pixel(1, 0, color)
+            self.speed.append(speed)
+            self.color.append(color)
+            self.chance.append(min(1.0, count / self.w))
+            self.offset.append(0.0)
+            self.shown.append(0)
+            self.drawn.append(0)
+            self.col_y.append(array("h", [-1] * self.sw))
+            self.strip.append(FrameBuffer(buf, self.sw, h, MONO_HLSB))
+            self.palette.append(pal)
+        for n in range(len(self.speed)):
+            for c in range(self.sw):
+                self._reseed(n, c)
+        self.active = len(self.speed)
+        self.blit_ok = None  # palette blit support, probed on first draw
+        self.window = bytearray(((w + 7) >> 3) * h)   # strip window for draw_rect
+        self.boxes = array("h", [0] * (4 * ((h + band - 1) // band)))
+
+    def set_active(self, n):
+        """Show only the first n layers; True if that changed the picture"""
+        n = min(max(n, 0), len(self.speed))
+        changed = n != self.active
+        self.active = n
+        return changed
+
+    def set_density(self, layer, count):
+        """Average stars on screen; applies as columns get reseeded"""
+        self.chance[layer] = min(1.0, count / self.w)
+
+    def _reseed(self, n, c):
+        col_y, strip = self.col_y[n], self.strip[n]
+        y = col_y[c]
+        if y >= 0:
+            strip.pixel(c, y, 0)
+        if random.random() < self.chance[n]:
+            y = random.randint(0, self.h - 1)
+            strip.pixel(c, y, 1)
+        else:
+            y = -1
+        col_y[c] = y
+
+    def update(self, dt):
+        """Scroll all active layers"""
+        sw, w = self.sw, self.w
+        for n in range(self.active):
+            old = self.shown[n]
+            off = (self.offset[n] + self.speed[n] * dt) % sw
+            self.offset[n] = off
+            new = int(off)
+            if new != old:
+                # reseed the columns about to enter on the right; the ones
+                # that just left keep their star until changes() erased it
+                c = (old + w) % sw
+                end = (new + w) % sw
+                while c != end:
+                    self._reseed(n, c)
+                    c = (c + 1) % sw
+                self.shown[n] = new
+
+    def moved(self):
+        """True if a layer scrolled since the last draw"""
+        for n in range(self.active):
+            if self.shown[n] != self.drawn[n]:
+                return True
+        return False
+
+    def changes(self, add):
+        """add(x1, y1, x2, y2) around the old and new positions of the stars
+        that moved since the last draw, one box per band and layer (corners
+        exclusive, may reach off screen)"""
+        sw, w, h, band = self.sw, self.w, self.h, self.band
+        boxes = self.boxes
+        nb = len(boxes) // 4
+        for n in range(self.active):
+            o = self.shown[n]
+            d = (o - self.drawn[n]) % sw
+            if not d:
+                continue
+            self.drawn[n] = o
+            if d > sw - w:
+                add(0, 0, w, h)   # scrolled past the margin: stars were reseeded
+                continue
+            for i in range(nb):
+                boxes[4 * i] = 32767   # empty band
+            col_y = self.col_y[n]
+            c = (o - d) % sw
+            for x in range(-d, w):
+                y = col_y[c]
+                if y >= 0:
+                    i = (y // band) * 4
+                    if boxes[i] == 32767:
+                        boxes[i], boxes[i + 1], boxes[i + 3] = x, y, y + 1
+                    elif y + 1 > boxes[i + 3]:
+                        boxes[i + 3] = y + 1
+                    elif y < boxes[i + 1]:
+                        boxes[i + 1] = y
+                    boxes[i + 2] = x + d + 1   # columns are visited left to right
+                c += 1
+                if c == sw:
+                    c = 0
+            for i in range(0, 4 * nb, 4):
+                if boxes[i] != 32767:
+                    add(boxes[i], boxes[i + 1], boxes[i + 2], boxes[i + 3])
+
+    def _probe(self, display):
+        try:
+            display.blit(self.strip[0], self.w, 0, 0, self.palette[0])
+            self.blit_ok = True
+        except:
+            self.blit_ok = False
+
+    def draw(self, display):
+        for n in range(self.active):
+            self.drawn[n] = self.shown[n]
+        if self.blit_ok is None:
+            self._probe(display)
+        if not self.blit_ok:
+            self.draw_rect(display, 0, 0, self.w, self.h)
+            return
+        sw, w = self.sw, self.w
+        for n in range(self.active):
+            o = self.shown[n]
+            display.blit(self.strip[n], -o, 0, 0, self.palette[n])
+            if sw - o < w:
+                display.blit(self.strip[n], sw - o, 0, 0, self.palette[n])
+
+    def draw_rect(self, display, x, y, w, h):
+        """Repaint only the stars inside a screen rectangle: each layer's
+        window of the strip is copied into a scratch 1-bit buffer of the
+        rectangle's size, then palette-blitted, so nothing outside is drawn"""
+        if self.blit_ok is None:
+            self._probe(display)
+        sw = self.sw
+        if self.blit_ok:
+            win = FrameBuffer(self.window, w, h, MONO_HLSB)
+            for n in range(self.active):
+                c = (x + self.shown[n]) % sw
+                win.blit(self.strip[n], -c, -y)
+                if c + w > sw:
+                    win.blit(self.strip[n], sw - c, -y)   # window wraps the strip end
+                display.blit(win, x, y, 0, self.palette[n])
+            return
+        # no palette blit: one pixel per star
+        y2 = y + h
+        for n in range(self.active):
+            col_y, color = self.col_y[n], self.color[n]
+            c = (x + self.shown[n]) % sw
+            for sx in range(x, x + w):
+                sy = col_y[c]
+                if y <= sy < y2:
+                    display.rect(sx, sy, 1, 1, color, True)
+                c += 1
+                if c == sw:
+                    c = 0
@@ -0,0 +1,41 @@
+"""Fixed-capacity struct-of-arrays entity store."""
+from array import array
+
+class EntityStore:
+    """Parallel typed columns with live entities packed in slots [0, count).
+
+    Columns are given as (name, typecode) pairs and exposed as attributes,
+    e.g. store.x[i]. Spawning and killing never allocate: kill() moves the
+    last live slot into the freed one (swap-remove), so iterate backwards
+    when removing inside a loop.
+    """
+
+    def __init__(self, capacity, columns):
+        self.capacity = capacity
+        self.count = 0
+        self.columns = []
+        for name, typecode in columns:
+            col = array(typecode, [0] * capacity)
+            setattr(self, name, col)
+            self.columns.append(col)
+
+    def spawn(self):
+        """Claim the next free slot; returns its index, or -1 when full"""
+        n = self.count
+        if n >= self.capacity:
+            return -1
+        self.count = n + 1
+        return n
+
+    def kill(self, i):
+        """Free slot i. Returns the slot whose entity moved into i (i itself
+        when it was the last one), so callers can fix external references."""
+        last = self.count - 1
+        if i != last:
+            for col in self.columns:
+                col[i] = col[last]
+        self.count = last
+        return last
+
+    def clear(self):
+        self.count = 0
@@ -0,0 +1,99 @@
+"""Cooperative periodic tasks on asyncio (uasyncio on the watch)."""
+import time
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+class Task:
+    def __init__(self, name, period_ms, fn, catch_up):
+        self.name = name
+        self.period = period_ms
+        self.fn = fn
+        self.catch_up = catch_up   # extra back-to-back runs allowed when late
+        self.runs = 0
+        self.wakes = 0
+        self.late_max = 0          # ms past the due time, worst case
+        self.late_sum = 0
+        self.skipped = 0           # due runs dropped because hopelessly late
+        self.busy_ms = 0           # time spent inside fn
+        self.rate = 0.0            # runs per second, updated every second
+
+class Scheduler:
+    """Runs each task at its own period as an asyncio coroutine.
+
+    A task that falls behind runs back-to-back up to catch_up extra times
+    (fixed-step simulation), then drops the rest of its backlog and counts
+    it as skipped. Lateness (how far past its due time each run started)
+    is tracked per task; report() prints it. Each task's rate (runs per
+    second, e.g. the frame rate of a render task) is kept like GameLoop.fps.
+    """
+
+    def __init__(self):
+        self.tasks = []
+        self.running = False
+
+    def every(self, name, period_ms, fn, catch_up=0):
+        t = Task(name, period_ms, fn, catch_up)
+        self.tasks.append(t)
+        return t
+
+    def stop(self):
+        self.running = False
+
+    async def _periodic(self, t):
+        ticks_ms, ticks_diff, ticks_add = time.ticks_ms, time.ticks_diff, time.ticks_add
+        due = rate_start = ticks_ms()
+        rate_runs = t.runs
+        while self.running:
+            now = ticks_ms()
+            late = ticks_diff(now, due)
+            if late < 0:
+                await asyncio.sleep(-late / 1000)  # woke early
+                continue
+            if late > t.late_max:
+                t.late_max = late
+            t.late_sum += late
+            t.wakes += 1
+            n = 0
+            while True:
+                t.fn()
+                t.runs += 1
+                due = ticks_add(due, t.period)
+                n += 1
+                if n > t.catch_up or ticks_diff(ticks_ms(), due) < 0:
+                    break
+            end = ticks_ms()
+            t.busy_ms += ticks_diff(end, now)
+            elapsed = ticks_diff(end, rate_start)
+            if elapsed >= 1000:
+                t.rate = (t.runs - rate_runs) * 1000 / elapsed
+                rate_start, rate_runs = end, t.runs
+            behind = ticks_diff(end, due)
+            if behind >= t.period:
+                # drop the backlog instead of running in a burst forever
+                t.skipped += behind // t.period
+                due = ticks_add(due, (behind // t.period) * t.period)
+            wait = ticks_diff(due, end)
+            await asyncio.sleep(wait / 1000 if wait > 0 else 0)
+
+    async def _main(self):
+        await asyncio.gather(*[self._periodic(t) for t in self.tasks])
+
+    def run(self):
+        self.running = True
+        try:
+            asyncio.run(self._main())
+        finally:
+            self.running = False
+
+    def busy(self):
+        """Total ms spent inside task functions so far"""
+        return sum(t.busy_ms for t in self.tasks)
+
+    def report(self):
+        print("task      period  runs   rate  late avg/max  skipped  busy")
+        for t in self.tasks:
+            avg = t.late_sum // t.wakes if t.wakes else 0
+            print("%-9s %4d ms %5d %5.1f/s %6d/%-5d %7d %5d ms" % (
+                t.name, t.period, t.runs, t.rate, avg, t.late_max, t.skipped, t.busy_ms))
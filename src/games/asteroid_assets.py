@@ -0,0 +1,95 @@
+"""Asteroid Dodge sprite assets: pre-baked atlas with procedural fallback.
+
+Frame order in the atlas: ROTATION_FRAMES frames for each entry of
+ASTEROID_CONFIGS. Frames are
+4-bit palette indices (GS4_HMSB, 0 = transparent, k = palette entry k-1),
+so colors come from the palette at blit time and PALETTES recolor them
+for free.
+Build it on the host with tools/build_asteroid_atlas.py. At run time
+FrameSource hands out single frames on demand: read from the atlas when it
+matches the current parameters, generated otherwise.
+"""
+import math
+from engine.atlas import param_hash, read_index, read_frame, write_atlas, FMT_GS4
+from engine.colors import rgb565
+from engine.procgen import GENERATOR_VERSION, ASTEROID_PALETTE, AsteroidGenerator
+
+ATLAS_PATH = "asteroids.atlas"
+
+ROTATION_FRAMES = 8
+ATLAS_FORMAT = FMT_GS4
+
+# Asteroid color variants, dark -> light; index 0 is the plain rock
+PALETTES = (
+    ASTEROID_PALETTE,
+    (rgb565(30, 50, 90), rgb565(70, 110, 160),     # icy
+     rgb565(130, 180, 220), rgb565(210, 240, 255)),
+    (rgb565(40, 40, 48), rgb565(80, 82, 95),       # metallic
+     rgb565(130, 135, 150), rgb565(200, 205, 215)),
+)
+
+# Different asteroid types, each gets ROTATION_FRAMES rotation frames
+ASTEROID_CONFIGS = [
+    {"w": 20, "h": 18},  # Medium asteroid
+    {"w": 16, "h": 16},  # Small round asteroid
+    {"w": 24, "h": 22},  # Large asteroid
+    {"w": 14, "h": 12},  # Small irregular asteroid
+    {"w": 18, "h": 20},  # Tall asteroid
+    {"w": 12, "h": 10},  # Tiny asteroid
+]
+
+def atlas_hash():
+    sizes = tuple((c["w"], c["h"]) for c in ASTEROID_CONFIGS)
+    return param_hash(GENERATOR_VERSION, ATLAS_FORMAT, sizes, ROTATION_FRAMES)
+
+def generate_frames():
+    """Run the procedural generators; returns [(w, h, data)] in atlas order"""
+    frames = []
+    for config in ASTEROID_CONFIGS:
+        w, h = config["w"], config["h"]
+        gen = AsteroidGenerator(w, h)  # polar tables shared by all frames
+        for frame in range(ROTATION_FRAMES):
+            rotation_angle = (frame * 2 * math.pi) / ROTATION_FRAMES
+            frames.append((w, h, gen.indexed(rotation_angle)))
+    return frames
+
+def build_atlas(path=ATLAS_PATH):
+    frames = generate_frames()
+    write_atlas(path, frames, atlas_hash(), ATLAS_FORMAT)
+    return frames
+
+class FrameSource:
+    """Single asteroid frames on demand, nothing loaded up front.
+
+    frame(t, n) returns (w, h, data) for rotation frame n of type t as a
+    fresh bytearray: read from the atlas if it was built from the current
+    parameters, otherwise generated (one generator per type, created on
+    first use).
+    """
+
+    def __init__(self, path=ATLAS_PATH):
+        self.index = read_index(path, atlas_hash(), ATLAS_FORMAT)
+        self.file = None
+        if self.index is not None:
+            try:
+                self.file = open(path, "rb")
+            except OSError:
+                self.index = None
+        self.from_atlas = self.index is not None
+        self.gens = {}
+
+    def size(self, t):
+        c = ASTEROID_CONFIGS[t]
+        return c["w"], c["h"]
+
+    def _read(self, i):
+        w, h, off = self.index[i]
+        return w, h, read_frame(self.file, w, h, off, ATLAS_FORMAT)
+
+    def frame(self, t, n):
+        if self.from_atlas:
+            return self._read(t * ROTATION_FRAMES + n)
+        gen = self.gens.get(t)
+        if gen is None:
+            gen = self.gens[t] = AsteroidGenerator(*self.size(t))
+        return gen.w, gen.h, gen.indexed((n * 2 * math.pi) / ROTATION_FRAMES)
@@ -1,164 +1,17 @@
 from Artemis import *
 from framebuf import FrameBuffer, RGB565
 import time, math, random
-# ---------- RGB565 helpers ----------
-import math
-
-def rgb565(r, g, b):
-    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
-
-def make_asteroid_fb(w=36, h=37):
-    # Background is 0 (use this as the transparent color when blitting)
-    data = bytearray(w * h * 2)
-
-    def setpx(x, y, color):
-        i = 2 * (y * w + x)
-        data[i] = (color >> 8) & 0xFF
-        data[i + 1] = color & 0xFF
-
-    # 4 brown/gray asteroid shades (dark -> light)
-    PALETTE = [
-        rgb565(40, 30, 25),    # darkest brown
-        rgb565(70, 50, 40),    # dark brown
-        rgb565(100, 70, 55),   # mid brown
-        rgb565(130, 95, 75)    # light brown highlight
-    ]
-
-    cx, cy = w // 2, h // 2
-    base_r = min(w, h) // 2 - 2
-
-    # build round asteroid with slight surface irregularity
-    for y in range(h):
-        for x in range(w):
-            dx, dy = x - cx, y - cy
-            r = math.sqrt(dx*dx + dy*dy)
-            ang = math.atan2(dy, dx)
-            
-            # Much smaller irregularity for round shape (not star-fish)
-            # Just small surface bumps and dents
-            irregular = 0.8 * math.sin(7*ang) + 0.5 * math.sin(11*ang + 2.1)
-            radius = base_r + irregular
-            
-            if r <= radius:
-                # fake lighting from upper-left
-                nx, ny = (dx / (r + 1e-6)), (dy / (r + 1e-6))
-                lx, ly = -0.4, -0.9
-                lambert = max(0.0, -(nx*lx + ny*ly))  # 0..1
-                if lambert < 0.25: shade = 0
-                elif lambert < 0.50: shade = 1
-                elif lambert < 0.75: shade = 2
-                else: shade = 3
-                setpx(x, y, PALETTE[shade])
-            else:
-                setpx(x, y, 0)  # transparent background
-
-    # add some darker craters (smaller and fewer)
-    def darken_circle(cx0, cy0, rad, deep=1):
-        r2 = rad*rad
-        for yy in range(max(0, cy0-rad), min(h, cy0+rad+1)):
-            for xx in range(max(0, cx0-rad), min(w, cx0+rad+1)):
-                dx, dy = xx - cx0, yy - cy0
-                if dx*dx + dy*dy <= r2:
-                    i = 2 * (yy * w + xx)
-                    col = (data[i] << 8) | data[i+1]
-                    if col != 0:
-                        # map to palette index and darken
-                        try:
-                            k = PALETTE.index(col)
-                        except ValueError:
-                            k = 1
-                        k = max(0, k - deep)
-                        newc = PALETTE[k]
-                        data[i]   = (newc >> 8) & 0xFF
-                        data[i+1] = newc & 0xFF
-
-    # Smaller, more realistic craters
-    darken_circle(cx-4, cy-3, 3, deep=2)
-    darken_circle(cx+3, cy-1, 2, deep=1)
-    darken_circle(cx-1, cy+4, 2, deep=2)
-
-    return FrameBuffer(data, w, h, RGB565)
-
-def make_rotating_asteroid_fb(w=20, h=18, rotation_offset=0):
-    """Create an asteroid with rotation baked into the generation"""
-    # Background is 0 (use this as the transparent color when blitting)
-    data = bytearray(w * h * 2)
-
-    def setpx(x, y, color):
-        i = 2 * (y * w + x)
-        data[i] = (color >> 8) & 0xFF
-        data[i + 1] = color & 0xFF
-
-    # 4 brown/gray asteroid shades (dark -> light)
-    PALETTE = [
-        rgb565(40, 30, 25),    # darkest brown
-        rgb565(70, 50, 40),    # dark brown
-        rgb565(100, 70, 55),   # mid brown
-        rgb565(130, 95, 75)    # light brown highlight
-    ]
-
-    cx, cy = w // 2, h // 2
-    base_r = min(w, h) // 2 - 2
-
-    # build round asteroid with surface irregularity rotated by rotation_offset
-    for y in range(h):
-        for x in range(w):
-            dx, dy = x - cx, y - cy
-            r = math.sqrt(dx*dx + dy*dy)
-            ang = math.atan2(dy, dx) + rotation_offset  # Add rotation offset
-            
-            # Small surface bumps and dents for natural look
-            irregular = 0.8 * math.sin(7*ang) + 0.5 * math.sin(11*ang + 2.1)
-            radius = base_r + irregular
-            
-            if r <= radius:
-                # fake lighting from upper-left (also rotated)
-                light_angle = rotation_offset
-                nx, ny = (dx / (r + 1e-6)), (dy / (r + 1e-6))
-                lx, ly = -0.4 * math.cos(light_angle) - 0.9 * math.sin(light_angle), 0.4 * math.sin(light_angle) - 0.9 * math.cos(light_angle)
-                lambert = max(0.0, -(nx*lx + ny*ly))  # 0..1
-                if lambert < 0.25: shade = 0
-                elif lambert < 0.50: shade = 1
-                elif lambert < 0.75: shade = 2
-                else: shade = 3
-                setpx(x, y, PALETTE[shade])
-            else:
-                setpx(x, y, 0)  # transparent background
-
-    # add some craters (also rotated)
-    def darken_circle(cx0, cy0, rad, deep=1):
-        r2 = rad*rad
-        # Rotate crater position
-        crater_angle = math.atan2(cy0 - cy, cx0 - cx) + rotation_offset
-        crater_dist = math.sqrt((cx0 - cx)**2 + (cy0 - cy)**2)
-        rotated_cx = int(cx + crater_dist * math.cos(crater_angle))
-        rotated_cy = int(cy + crater_dist * math.sin(crater_angle))
-        
-        for yy in range(max(0, rotated_cy-rad), min(h, rotated_cy+rad+1)):
-            for xx in range(max(0, rotated_cx-rad), min(w, rotated_cx+rad+1)):
-                dx, dy = xx - rotated_cx, yy - rotated_cy
-                if dx*dx + dy*dy <= r2:
-                    i = 2 * (yy * w + xx)
-                    col = (data[i] << 8) | data[i+1]
-                    if col != 0:
-                        try:
-                            k = PALETTE.index(col)
-                        except ValueError:
-                            k = 1
-                        k = max(0, k - deep)
-                        newc = PALETTE[k]
-                        data[i]   = (newc >> 8) & 0xFF
-                        data[i+1] = newc & 0xFF
-
-    # Add craters
-    darken_circle(cx-4, cy-3, 3, deep=2)
-    darken_circle(cx+3, cy-1, 2, deep=1)
-    darken_circle(cx-1, cy+4, 2, deep=2)
-
-    return FrameBuffer(data, w, h, RGB565)
-
-# Build the sprite once:
-sprite_asteroid1 = make_asteroid_fb(36, 37)
+from engine import (rgb565, named, aabb, UniformGrid, mask_hits_rect, EntityStore,
+                    Sequencer, DirtyRenderer, Starfield, GameLoop, Profiler, Recorder,
+                    Player, Hud, Bitmap, SpriteStrip, probe_blit, probe_palette_blit,
+                    SpriteManager, AnimClock, Controls, Governor)
+from engine.kernels import advance, translate
+import asteroid_assets
+from asteroid_assets import ROTATION_FRAMES
+
+# Asteroid frames come from the pre-baked atlas (or the generator if it is
+# missing/stale) one at a time, as the game first needs them
+ASSETS = asteroid_assets.FrameSource()
 ASTER_TRANSPARENT = 0  # background value we used
 
 begin()
@@ -177,38 +30,26 @@ def print_runtime():
 
 # Print initial startup time
 print("Asteroid Dodge game initialized!")
+print("Asteroid sprites: " + ("atlas" if ASSETS.from_atlas else "generated"))
 print_runtime()
 
 # -------- screen ----------
 W, H = 128, 128
 
 # -------- safe colors -----
+# Colors this firmware may lack fall back to white or a packed RGB565 value
 WHITE = Display.Color.White
-try: YELLOW = Display.Color.Yellow
-except: YELLOW = WHITE
-try: GRAY = Display.Color.Gray
-except: GRAY = WHITE
+YELLOW = named(Display.Color, "Yellow", WHITE)
+GRAY = named(Display.Color, "Gray", WHITE)
 
 # Fire blaster colors (orange and red)
-try: RED = Display.Color.Red
-except: RED = rgb565(255, 0, 0)  # Fallback red
-try: ORANGE = Display.Color.Orange
-except: ORANGE = rgb565(255, 165, 0)  # Fallback orange
-
-# -------- tiny "pixel" built from rect (no display.circle/triangle/line used) ----
-def setpix(x, y, color):
-    display.rect(int(x), int(y), 1, 1, color, True)
-
-# -------- bitmap helpers (draw with our 1x1 rect pixel) --------
-def draw_bitmap(x, y, bmp_rows, color):
-    # bmp_rows: list of strings, 'X' = filled, '.' = empty
-    for j, row in enumerate(bmp_rows):
-        for i, ch in enumerate(row):
-            if ch == 'X':
-                setpix(x + i, y + j, color)
-
-def size_of_bitmap(bmp_rows):
-    return (len(bmp_rows[0]), len(bmp_rows))
+RED = named(Display.Color, "Red", rgb565(255, 0, 0))
+ORANGE = named(Display.Color, "Orange", rgb565(255, 165, 0))
+
+# -------- blit support, probed once --------
+# Decides between sprite blits and the compiled ASCII fallbacks up front,
+# instead of catching a failed blit for every sprite on every frame
+BLIT_OK = probe_blit(display)
 
 # -------- ship sprite (using alien2 from gyro game) ------------
 sprite_alien2 = FrameBuffer(bytearray(b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x7F\xE0\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x5C\x85\x8E\x69\xCF\xF2\x86\x29\x5C\x45\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x55\x80\x86\x86\xB7\xEC\xCF\xF2\xAF\x8C\x7E\x46\x55\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x54\x63\x86\xA6\xAF\xCC\xCF\xF2\xAF\xCC\x86\xA5\x54\x63\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x54\x63\x86\xC5\xAF\xCB\xCF\xF2\xAF\xCB\x7E\xC5\x54\x63\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x54\x43\x7E\xA5\xA7\xEA\xB7\xED\x9F\xE8\x7E\xA4\x4C\x42\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x5D\x41\x7F\x23\xA7\xA9\xA7\xE9\x97\xE4\x7F\x42\x5D\x61\x00\x00'+
@@ -232,38 +73,40 @@ SHIP_W, SHIP_H = 19, 21  # Use alien2 sprite dimensions
 
 BULLET_W, BULLET_H = 5, 2
 
-# -------- asteroid sprites using procedural generation --------
-# Generate different sized asteroids using the make_asteroid_fb function
-
-# Create various asteroid sizes with rotation frames (8 frames per asteroid type)
-ROTATION_FRAMES = 8
-ASTEROID_SPRITES = []
-
-# Generate different asteroid types with rotation frames
-asteroid_configs = [
-    {"w": 20, "h": 18},  # Medium asteroid
-    {"w": 16, "h": 16},  # Small round asteroid  
-    {"w": 24, "h": 22},  # Large asteroid
-    {"w": 14, "h": 12},  # Small irregular asteroid
-    {"w": 18, "h": 20},  # Tall asteroid
-    {"w": 12, "h": 10},  # Tiny asteroid
-]
-
-for config in asteroid_configs:
-    w, h = config["w"], config["h"]
-    # Create rotation frames for this asteroid type
-    rotation_frames = []
-    for frame in range(ROTATION_FRAMES):
-        rotation_angle = (frame * 2 * math.pi) / ROTATION_FRAMES
-        sprite = make_rotating_asteroid_fb(w, h, rotation_angle)
-        rotation_frames.append(sprite)
-    
-    ASTEROID_SPRITES.append({
-        "frames": rotation_frames,
-        "transparent": ASTER_TRANSPARENT,
-        "w": w,
-        "h": h
-    })
+# -------- bullet fire effect ------------
+# Body plus 2px trail, pre-rendered once per flicker phase; a bullet draws
+# with one blit of the frame picked by its integer age (in steps).
+# Frame 0: orange body, red trail; frame 1 swaps them.
+BULLET_ART = (
+    "ttbbbbb",
+    "ttbbbbb",
+)
+BULLET_FX_W = BULLET_W + 2
+BULLET_FRAME_MS = 62  # ~8 flicker cycles per second
+BULLET_FX = SpriteStrip(BULLET_FX_W, BULLET_H, 2)
+BULLET_FX.paint(0, BULLET_ART, {"b": ORANGE, "t": RED})
+BULLET_FX.paint(1, BULLET_ART, {"b": RED, "t": ORANGE})
+# Body only, steady color: drawn instead when the quality governor drops trails
+BULLET_CORE = SpriteStrip(BULLET_W, BULLET_H, 1)
+BULLET_CORE.paint(0, BULLET_ART, {"b": ORANGE})
+
+# -------- asteroid sprites, cached on demand --------
+# Each asteroid type has ROTATION_FRAMES frames, loaded on first use into a
+# byte-budgeted LRU cache together with a packed 1-bit opacity mask for
+# pixel-accurate collisions. The next rotation frame of every asteroid is
+# prefetched in spare frame time, so draws rarely miss.
+# Frames are 4-bit palette indices blitted through one palette per color
+# variant. Displays that cannot blit with a palette get RGB565 copies in the
+# rock colors instead (4x the RAM, no variants). Without blit the fallback
+# art is drawn and only the collision masks are loaded.
+PALETTE_BLIT = BLIT_OK and probe_palette_blit(display)
+SPRITE_CACHE_BYTES = 8 * 1024  # all 8-frame types need ~9 KB with masks
+PREFETCH_MIN_MS = 4            # spare frame time needed to prefetch a frame
+
+SPRITES = SpriteManager(ASSETS, len(asteroid_assets.ASTEROID_CONFIGS), ROTATION_FRAMES,
+                        asteroid_assets.PALETTES, SPRITE_CACHE_BYTES, PALETTE_BLIT,
+                        ASTER_TRANSPARENT, blit=BLIT_OK)
+VARIANTS = len(SPRITES.palettes)
 
 # Fallback ASCII asteroid for compatibility
 AST_BMP = [                   # 14x12 asteroid blob
@@ -280,83 +123,189 @@ AST_BMP = [                   # 14x12 asteroid blob
     "...XXXXX......",
     "...XXXX.......",
 ]
-AST_W, AST_H = 24, 22  # Use largest asteroid sprite size for collision detection
+AST_W, AST_H = 24, 22  # Largest asteroid sprite size (spawn and cull bounds)
+
+# Fallback art compiled once, only for displays without blit. DRAW_SIZES
+# is the box each asteroid type covers on screen (collisions keep the
+# sprite sizes either way)
+DRAW_SIZES = SPRITES.sizes
+if not BLIT_OK:
+    SHIP_FALLBACK = Bitmap(SHIP_BMP, WHITE)
+    AST_FALLBACK = Bitmap(AST_BMP, GRAY)
+    DRAW_SIZES = [(AST_FALLBACK.w, AST_FALLBACK.h)] * len(SPRITES.sizes)
 
 # -------- game state -----------------
+# Entities live in fixed-capacity struct-of-arrays stores, so spawning and
+# despawning never touch the heap during play
+# Stress mode keeps adding asteroids until the frame budget is exhausted
+# at the cheapest quality level, to measure how far the loop scales
+STRESS = False
+STRESS_RAMP_MS = 500   # one more asteroid wanted every half second
+MAX_BULLETS = 16
+MAX_ENEMIES = 96 if STRESS else 24
+
 class Game:
     def __init__(self):
         self.ship_x = 10
         self.ship_y = H//2 - SHIP_H//2
         self.ship_vy = 0.0  # ship vertical velocity
         
-        self.stars = [{"x": random.randint(0, W-1),
-                       "y": random.randint(0, H-1),
-                       "s": random.choice([1,1,2])} for _ in range(34)]
-
-        self.bullets = []  # dict: x,y
-        self.enemies = []  # dict: x,y,vx,sprite_idx
+        self.bullets = EntityStore(MAX_BULLETS, (("x", "f"), ("y", "f"), ("age", "H")))  # age in steps
+        self.enemies = EntityStore(MAX_ENEMIES, (
+            ("x", "f"), ("y", "f"), ("vx", "f"),
+            ("sprite_idx", "B"), ("variant", "B"),
+            ("rot_t0", "l"), ("rot_rate", "H")))  # rotation phase origin and rate
         self.score = 0
         self.cooldown = 0.0
         self.spawn_cd = 0.0
+        self.stress_target = 0  # asteroids wanted on screen in stress mode
+        self.stress_cd = 0      # ms until the target grows
+        self.stress_limit = 0   # asteroids on screen when the budget ran out
         
         # Ship control state
         self.up_pressed = False
         self.down_pressed = False
 
 G = Game()
+ANIM = AnimClock()  # drives every looping animation, advanced per step
 
 # -------- tunables -------------------
 STAR_SPEED = 26
+# Parallax layers: (speed px/s, color, stars on screen); the quality
+# governor hides layers from the end, so the far one goes first
+STAR_LAYERS = (
+    (STAR_SPEED + 20, WHITE, 11),  # near, bright
+    (STAR_SPEED + 10, GRAY, 23),   # far, dim
+)
 BULLET_SPEED = 160.0
 FIRE_RATE = 0.18
 ENEMY_MIN_SPD, ENEMY_MAX_SPD = 24.0, 48.0
 SPAWN_EVERY = (0.65, 1.2)
+VARIANT_CHANCE = 0.3  # share of icy/metallic asteroids
 COLLISION_INSET = 1
+STEP_MS = 16  # fixed simulation step
+
+# -------- record / replay ------------
+# "record" logs the RNG seed, button events and every frame's dt to
+# REPLAY_FILE; "replay" plays it back exactly and checks the entity counts
+# on every frame; "bench" replays with a fixed dt and no frame pacing, as
+# fast as the device runs. Set up before anything draws random numbers.
+REPLAY_MODE = None
+REPLAY_FILE = "session.rec"
+
+def replay_probe():
+    return "%d,%d,%d" % (G.enemies.count, G.bullets.count, G.score)
+
+INPUT = None  # Recorder or Player while recording/replaying
+if REPLAY_MODE == "record":
+    INPUT = Recorder(REPLAY_FILE, probe=replay_probe)
+elif REPLAY_MODE in ("replay", "bench"):
+    INPUT = Player(REPLAY_FILE, probe=replay_probe,
+                   fixed_ms=STEP_MS if REPLAY_MODE == "bench" else 0,
+                   on_end=lambda: LOOP.stop())
+REPLAYING = isinstance(INPUT, Player)
+
+# -------- runtime --------------------
+# "loop": one fixed-timestep loop. "tasks": cooperative asyncio tasks, each
+# at its own rate (input faster than render, audio on its own timer,
+# telemetry out of the hot path). Record/replay needs the loop.
+RUNTIME = "loop"
+TASKS = RUNTIME == "tasks" and INPUT is None
+INPUT_MS, RENDER_MS, AUDIO_MS, PREFETCH_MS = 8, 16, 10, 20
+
+# Broadphase grid over the playfield (16px cells), keyed by store slot;
+# bullet keys are offset so they never clash with enemy slots
+GRID = UniformGrid(W, H)
+ENEMY_LAYER, BULLET_LAYER = 0, 1
+BULLET_KEY = MAX_ENEMIES
+
+# Scrolling background, one pre-rendered strip per parallax speed
+STARS = Starfield(W, H, STAR_LAYERS)
+
+# Dirty-rectangle renderer; every drawable gets a stable key
+RK_ENEMIES = 0
+RK_BULLETS = RK_ENEMIES + MAX_ENEMIES
+RK_SHIP = RK_BULLETS + MAX_BULLETS
+RK_SCORE = RK_SHIP + 1
+RK_FPS = RK_SCORE + 1
+RK_PROF = RK_FPS + 1
+R = DirtyRenderer(display, W, H, max_keys=RK_PROF + 1)
+DEBUG_DIRTY = False  # outline the repainted regions
+R.debug = DEBUG_DIRTY
+R.background = STARS
+
+# HUD text is cached per field and only re-rasterized when its value changes
+SHOW_FPS = False
+HUD = Hud(blit=BLIT_OK)
+HUD_SCORE = HUD.add(4, 4, "Score: ", 5, WHITE)
+HUD_FPS = HUD.add(4, H - 12, "FPS ", 3, YELLOW)
+
+# Per-phase frame profiler; dumps over serial with the console stats and on
+# the Back button, optionally draws a stacked bar along the bottom edge
+PROFILE = False
+PROFILE_OVERLAY = False
+PH_INPUT, PH_TICK, PH_MOVE, PH_COLLIDE, PH_DESPAWN, PH_DRAW, PH_COMMIT = range(7)
+PROF = Profiler(("input", "tick", "move", "collide", "despawn", "draw", "commit"))
+PROF.enable(PROFILE)
+PROF_COLORS = (GRAY, YELLOW, WHITE, RED, GRAY, ORANGE, YELLOW)
+PROF_BAR_H = 3
+
+# Adaptive quality: when frames keep overrunning the budget the governor
+# steps through these levels (each keeps the savings of the ones before)
+# and undoes them, one at a time, once load has stayed low. Off while
+# recording or replaying, since frozen rotation changes collisions.
+GOVERN = True
+Q_HUD, Q_TRAILS, Q_STARS, Q_ROTATION = 1, 2, 3, 4
+HUD_EVERY = 1          # renders between HUD refreshes
+TRAILS = True          # bullet fire trail and flicker
+ANIM_FROZEN = False    # asteroid rotation stopped
+
+def apply_quality(level):
+    global HUD_EVERY, TRAILS, ANIM_FROZEN
+    HUD_EVERY = 8 if level >= Q_HUD else 1
+    TRAILS = level < Q_TRAILS
+    if STARS.set_active(1 if level >= Q_STARS else len(STAR_LAYERS)):
+        R.invalidate()
+    ANIM_FROZEN = level >= Q_ROTATION
+
+GOV = Governor(STEP_MS, Q_ROTATION, apply_quality)
+GOVERNING = GOVERN and INPUT is None
 
 # Ship movement constants
 SHIP_SPEED = 150.0  # Increased from 80.0 for faster movement
 SHIP_FRICTION = 0.85
 
-# -------- sound (safe) ---------------
-def tick(freq=1400, ms=20):
-    try: piezo.tone(freq, ms)
-    except: pass
-
-def hit_sound():
-    # Enhanced asteroid hit sound inspired by sfxr parameters
-    # Simulating: attack->sustain->punch->decay with frequency slide
-    try:
-        # Attack phase: Quick high-pitched impact (simulating p_env_attack: 0)
-        piezo.tone(1200, 30)   # Sharp initial hit
-        
-        # Sustain phase: Medium frequency hold (p_env_sustain: 0.32)
-        time.sleep_ms(10)
-        piezo.tone(800, 60)    # Sustained impact tone
-        
-        # Punch phase: Brief frequency boost (p_env_punch: 0.62)
-        time.sleep_ms(20)
-        piezo.tone(1000, 40)   # Punch emphasis
-        
-        # Decay phase: Sliding down frequency (p_env_decay: 0.44, p_freq_ramp: 0.17)
-        time.sleep_ms(15)
-        piezo.tone(600, 50)    # Decay start
-        time.sleep_ms(25)
-        piezo.tone(400, 60)    # Frequency slide down
-        time.sleep_ms(30)
-        piezo.tone(200, 40)    # Final decay
-        
-    except: pass
+# -------- sound (non-blocking) -------
+# Effects are (freq, ms) step tables played by the sequencer, which the main
+# loop advances once per frame, so audio never stalls the game.
+
+# Asteroid hit inspired by sfxr parameters:
+# attack -> sustain -> punch -> decay with a frequency slide
+HIT_SFX = (
+    (1200, 10),  # Attack: sharp initial hit
+    (800, 20),   # Sustain: medium frequency hold
+    (1000, 15),  # Punch: brief frequency boost
+    (600, 25),   # Decay start
+    (400, 30),   # Frequency slide down
+    (200, 40),   # Final decay
+)
+FIRE_SFX = ((1400, 20),)
 
-def fire_sound():
-    try: piezo.tone(1400, 20)
-    except: pass
+SFX_FIRE, SFX_HIT = 1, 2  # priorities: a hit preempts the blaster
+SFX = Sequencer(lambda freq, ms: piezo.tone(freq, ms))  # errors are swallowed
+
+hit_sound = SFX.cue(HIT_SFX, SFX_HIT)
+fire_sound = SFX.cue(FIRE_SFX, SFX_FIRE)
 
 # -------- controls: SHIP MOVEMENT & FIRE --
 def fire():
     if G.cooldown > 0: return
     nose_x = G.ship_x + SHIP_W + 1
     nose_y = G.ship_y + SHIP_H//2
-    G.bullets.append({"x": float(nose_x), "y": float(nose_y), "age": 0.0})
+    b = G.bullets
+    i = b.spawn()
+    if i < 0: return
+    b.x[i], b.y[i], b.age[i] = nose_x, nose_y, 0
     G.cooldown = FIRE_RATE
     fire_sound()
 
@@ -372,53 +321,65 @@ def stop_up():
 def stop_down():
     G.down_pressed = False
 
-def bind_buttons():
-    # Fire button
-    def try_bind_fire(name):
-        try:
-            btn = getattr(Buttons, name)
-            buttons.on_press(btn, lambda: fire())
-        except:
-            pass
-    
-    # Movement buttons - both press and release events
-    try:
-        buttons.on_press(Buttons.Up, move_up)
-        buttons.on_release(Buttons.Up, stop_up)
-        buttons.on_press(Buttons.Down, move_down)
-        buttons.on_release(Buttons.Down, stop_down)
-    except:
-        pass
-    
-    # Try different fire button names
-    for n in ["A","Ok","Select","Center","Confirm","Right"]:
-        try_bind_fire(n)
-
-bind_buttons()
+# every callback goes through the recorder/player when one is active;
+# buttons this firmware lacks are skipped
+CONTROLS = Controls(buttons, Buttons, INPUT.bind if INPUT is not None else None)
+CONTROLS.hold("Up", move_up, stop_up)
+CONTROLS.hold("Down", move_down, stop_down)
+# Try different fire button names
+CONTROLS.bind_any(("A", "Ok", "Select", "Center", "Confirm", "Right"), fire)
+# Profiler summary on demand
+CONTROLS.bind("Back", True, lambda: PROF.dump() if PROF.enabled else None, raw=True)
 
 # -------- world helpers --------------
-def move_stars(dt):
-    for st in G.stars:
-        st["x"] -= (STAR_SPEED + st["s"]*10) * dt
-        if st["x"] < 0:
-            st["x"] = W - 1
-            st["y"] = random.randint(0, H-1)
-
 def spawn_enemy():
     y = random.randint(4, H - AST_H - 4)
     speed = random.uniform(ENEMY_MIN_SPD, ENEMY_MAX_SPD)
-    sprite_idx = random.randint(0, len(ASTEROID_SPRITES) - 1)
+    sprite_idx = random.randint(0, len(SPRITES.sizes) - 1)
     rotation_speed = random.uniform(0.5, 2.0)  # radians per second
     rotation_frame = random.randint(0, ROTATION_FRAMES - 1)  # random starting frame
-    G.enemies.append({
-        "x": float(W + 2), 
-        "y": float(y), 
-        "vx": -speed, 
-        "sprite_idx": sprite_idx,
-        "rotation_frame": rotation_frame,
-        "rotation_speed": rotation_speed,
-        "rotation_timer": 0.0
-    })
+    variant = 0
+    if VARIANTS > 1 and random.random() < VARIANT_CHANCE:
+        variant = random.randint(1, VARIANTS - 1)
+    e = G.enemies
+    i = e.spawn()
+    if i < 0: return  # store full: skip this spawn
+    e.x[i] = W + 2
+    e.y[i] = y
+    e.vx[i] = -speed
+    e.sprite_idx[i] = sprite_idx
+    e.variant[i] = variant
+    rate = ANIM.rate(rotation_speed * ROTATION_FRAMES / (2 * math.pi))
+    e.rot_rate[i] = rate
+    e.rot_t0[i] = ANIM.origin(rate, rotation_frame)
+    if BLIT_OK:
+        SPRITES.want(sprite_idx, rotation_frame)
+
+def stress_spawn():
+    # raise the wanted asteroid count until the governor runs out of levels
+    if not G.stress_limit:
+        if GOV.saturated:
+            G.stress_limit = G.enemies.count
+            print(f"Stress: budget hit with {G.stress_limit} asteroids, {GOV.status()}")
+        else:
+            G.stress_cd -= STEP_MS
+            if G.stress_cd <= 0 and G.stress_target < MAX_ENEMIES:
+                G.stress_target += 1
+                G.stress_cd = STRESS_RAMP_MS
+    if G.enemies.count < G.stress_target:
+        spawn_enemy()
+
+def kill_enemy(i):
+    GRID.remove(i)
+    moved = G.enemies.kill(i)
+    if moved != i:
+        GRID.remove(moved)  # re-inserted under slot i on the next update
+
+def kill_bullet(i):
+    GRID.remove(BULLET_KEY + i)
+    moved = G.bullets.kill(i)
+    if moved != i:
+        GRID.remove(BULLET_KEY + moved)
 
 def update_ship_movement(dt):
     # Apply movement based on button presses
@@ -443,124 +404,271 @@ def update_ship_movement(dt):
     
     # Don't reset button states - they're managed by press/release events
 
-def draw_asteroid(x, y, sprite_idx, rotation_frame):
+def draw_asteroid(x, y, sprite_idx, rotation_frame, variant=0):
     # Draw asteroid using FrameBuffer sprites with rotation
-    try:
-        asteroid_data = ASTEROID_SPRITES[sprite_idx]
-        sprite = asteroid_data["frames"][rotation_frame]
-        transparent = asteroid_data["transparent"]
-        
-        # Draw the asteroid sprite using display.blit
-        display.blit(sprite, int(x), int(y), transparent)
-        
-    except:
-        # Fallback to ASCII art if sprite fails
-        draw_bitmap(int(x), int(y), AST_BMP, GRAY)
-
-def aabb(ax1, ay1, ax2, ay2, bx1, by1, bx2, by2):
-    return not (ax2 < bx1 or ax1 > bx2 or ay2 < by1 or ay1 > by2)
+    if BLIT_OK:
+        SPRITES.draw(display, sprite_idx, rotation_frame, x, y, variant)
+    else:
+        AST_FALLBACK.draw(display, x, y)
+
+def bullet_frame(age):
+    return (age * STEP_MS // BULLET_FRAME_MS) % BULLET_FX.n
+
+def enemy_frame(i):
+    e = G.enemies
+    return ANIM.frame(e.rot_t0[i], e.rot_rate[i], ROTATION_FRAMES)
+
+def bullet_hits_asteroid(ei, bi):
+    # True-size AABB of this sprite first, then the frame's pixel mask
+    e, b = G.enemies, G.bullets
+    w, h = SPRITES.sizes[e.sprite_idx[ei]]
+    ex, ey, bx, by = e.x[ei], e.y[ei], b.x[bi], b.y[bi]
+    if not aabb(ex + COLLISION_INSET, ey + COLLISION_INSET,
+                ex + w - COLLISION_INSET, ey + h - COLLISION_INSET,
+                bx, by - BULLET_H//2, bx + BULLET_W, by + BULLET_H//2):
+        return False
+    # bullet body in sprite-local pixels, as drawn
+    lx = int(bx) - int(ex)
+    ly = int(by - BULLET_H//2) - int(ey)
+    return mask_hits_rect(SPRITES.get(e.sprite_idx[ei], enemy_frame(ei))[1], w, h,
+                          lx, ly, lx + BULLET_W - 1, ly + BULLET_H - 1)
 
 # -------- main loop ------------------
-last_ms = time.ticks_ms()
+# Fixed 16 ms simulation steps; rendering is paced separately and skipped
+# when the simulation falls behind
+LOOP = GameLoop(step_ms=STEP_MS, frame_ms=STEP_MS)
+if REPLAY_MODE == "bench":
+    LOOP.pace = False
+
+def fps():
+    # renders per second from whichever runtime drives render()
+    return RENDER_TASK.rate if TASKS else LOOP.fps
+
+def telemetry():
+    print_runtime()
+    print(f"Score: {G.score}, Enemies: {G.enemies.count}, Bullets: {G.bullets.count}")
+    if GOVERNING:
+        print("Governor: " + GOV.status())
+    if STRESS:
+        print(f"Stress: {G.enemies.count}/{G.stress_target} asteroids, limit {G.stress_limit or '-'}")
+    if TASKS:
+        SCHED.report()
+    else:
+        print(f"FPS: {LOOP.fps:.1f}, slow frames: {LOOP.slow_frames}, skipped renders: {LOOP.skipped_renders}")
+    print("Sprite cache: " + SPRITES.stats())
+    if PROF.enabled:
+        PROF.dump()
+
+last_busy = 0
+
+def govern():
+    # feed the governor the work time of one frame: the loop's last frame,
+    # or under TASKS what all tasks spent since the previous render
+    global last_busy
+    if TASKS:
+        busy = SCHED.busy()
+        GOV.sample(busy - last_busy)
+        last_busy = busy
+    else:
+        GOV.sample(LOOP.work_ms)
 
-while True:
-    buttons.scan()
+def poll():
+    global last_console_print
+    PROF.mark()
+    if REPLAYING:
+        INPUT.poll()
+    else:
+        buttons.scan()
+    if GOVERNING and not TASKS:
+        govern()
+    PROF.lap(PH_INPUT)
+
+    # Print runtime to console periodically (a task of its own under TASKS)
+    if not TASKS:
+        now = time.ticks_ms()
+        if time.ticks_diff(now, last_console_print) >= CONSOLE_PRINT_INTERVAL:
+            telemetry()
+            last_console_print = now
+
+last_audio = time.ticks_ms()
+
+def audio():
+    global last_audio
     now = time.ticks_ms()
-    dt = max(0, time.ticks_diff(now, last_ms)) / 1000.0
-    last_ms = now
-    
-    # Print runtime to console periodically
-    if time.ticks_diff(now, last_console_print) >= CONSOLE_PRINT_INTERVAL:
-        print_runtime()
-        print(f"Score: {G.score}, Enemies: {len(G.enemies)}, Bullets: {len(G.bullets)}")
-        last_console_print = now
+    SFX.update(time.ticks_diff(now, last_audio))
+    last_audio = now
 
+def step(dt):
+    PROF.mark()
     # cooldowns
     if G.cooldown > 0: G.cooldown = max(0.0, G.cooldown - dt)
-    if G.spawn_cd <= 0:
+    if STRESS:
+        stress_spawn()
+    elif G.spawn_cd <= 0:
         spawn_enemy()
         G.spawn_cd = random.uniform(*SPAWN_EVERY)
     else:
         G.spawn_cd -= dt
 
+    # shared animation clock, one fixed step at a time (held at Q_ROTATION)
+    if not ANIM_FROZEN:
+        ANIM.advance(STEP_MS)
+
+    # advance queued sound effects (own task under TASKS)
+    if not TASKS:
+        SFX.update(int(dt * 1000))
+    PROF.lap(PH_TICK)
+
     # update ship movement based on button presses
     update_ship_movement(dt)
 
-    # move stars
-    move_stars(dt)
+    # scroll the starfield; the renderer repaints the stars that moved
+    STARS.update(dt)
 
     # bullets
-    for b in G.bullets:
-        b["x"] += BULLET_SPEED * dt
-        b["age"] += dt  # Track bullet age for fire effect
-    G.bullets = [b for b in G.bullets if b["x"] < W+6]
-
-    # enemies (movement and rotation)
-    for e in G.enemies:
-        e["x"] += e["vx"] * dt
-        
-        # Update rotation animation
-        e["rotation_timer"] += dt
-        frame_duration = (2 * math.pi) / (e["rotation_speed"] * ROTATION_FRAMES)
-        if e["rotation_timer"] >= frame_duration:
-            e["rotation_timer"] = 0.0
-            e["rotation_frame"] = (e["rotation_frame"] + 1) % ROTATION_FRAMES
-    
-    G.enemies = [e for e in G.enemies if e["x"] + AST_W > -4]
-
-    # collisions (bullets vs enemies)
-    survivors = []
-    for e in G.enemies:
-        hit = False
-        ex1 = e["x"] + COLLISION_INSET
-        ey1 = e["y"] + COLLISION_INSET
-        ex2 = e["x"] + AST_W - COLLISION_INSET
-        ey2 = e["y"] + AST_H - COLLISION_INSET
-        for b in G.bullets:
-            bx1 = b["x"]
-            by1 = b["y"] - BULLET_H//2
-            bx2 = b["x"] + BULLET_W
-            by2 = b["y"] + BULLET_H//2
-            if aabb(ex1, ey1, ex2, ey2, bx1, by1, bx2, by2):
-                hit = True
-                b["x"] = W + 99
-                break
-        if hit:
+    b = G.bullets
+    translate(b.x, b.count, BULLET_SPEED * dt)
+    translate(b.age, b.count, 1)  # Track bullet age for fire effect
+    for i in range(b.count):
+        GRID.update(BULLET_KEY + i, i, BULLET_LAYER, b.x[i], b.y[i] - BULLET_H//2,
+                    b.x[i] + BULLET_W, b.y[i] + BULLET_H//2)
+
+    # enemies (rotation frames are derived from ANIM when drawn)
+    e = G.enemies
+    advance(e.x, e.vx, e.count, dt)
+    for i in range(e.count):
+        w, h = SPRITES.sizes[e.sprite_idx[i]]
+        GRID.update(i, i, ENEMY_LAYER, e.x[i] + COLLISION_INSET, e.y[i] + COLLISION_INSET,
+                    e.x[i] + w - COLLISION_INSET, e.y[i] + h - COLLISION_INSET)
+
+    PROF.lap(PH_MOVE)
+
+    # collisions (bullets vs enemies): only pairs sharing a grid cell are tested,
+    # one bullet kills one asteroid
+    for ei, bi in GRID.pairs():
+        if b.x[bi] >= W + 6 or e.x[ei] + AST_W <= -4:
+            continue  # off-screen, or already used up this frame
+        if bullet_hits_asteroid(ei, bi):
+            b.x[bi] = W + 99
+            e.x[ei] = -99.0
             hit_sound()
             G.score += 1
-        else:
-            survivors.append(e)
-    G.enemies = survivors
-    G.bullets = [b for b in G.bullets if b["x"] < W+10]
-
-    # ------------ render ---------------
-    display.fill(0)
-    # stars
-    for st in G.stars:
-        setpix(st["x"], st["y"], WHITE if st["s"]==2 else GRAY)
+
+    PROF.lap(PH_COLLIDE)
+
+    # despawn (backwards, swap-remove keeps earlier slots intact)
+    for i in range(e.count - 1, -1, -1):
+        if e.x[i] + AST_W <= -4:
+            kill_enemy(i)
+    for i in range(b.count - 1, -1, -1):
+        if b.x[i] >= W + 6:
+            kill_bullet(i)
+    PROF.lap(PH_DESPAWN)
+
+# ------------ render ---------------
+ENEMY_FRAMES = bytearray(MAX_ENEMIES)  # rotation frame per enemy, this render
+render_count = 0
+
+def render():
+    global render_count
+    PROF.frame()
+    if GOVERNING and TASKS:
+        govern()
+    render_count += 1
+    hud_due = render_count % HUD_EVERY == 0
+    e, b = G.enemies, G.bullets
+    # record where everything is, then clear and redraw only dirty regions
+    R.begin()
+    frames = ENEMY_FRAMES
+    for i in range(e.count):
+        t = e.sprite_idx[i]
+        f = frames[i] = enemy_frame(i)
+        if BLIT_OK:
+            SPRITES.want(t, (f + 1) % ROTATION_FRAMES)  # next, for idle prefetch
+        w, h = DRAW_SIZES[t]
+        R.mark(RK_ENEMIES + i, e.x[i], e.y[i], w, h,
+               (t * ROTATION_FRAMES + f) * 4 + e.variant[i])
+    R.mark(RK_SHIP, G.ship_x, G.ship_y, SHIP_W, SHIP_H)
+    for i in range(b.count):
+        R.mark(RK_BULLETS + i, b.x[i] - 2, b.y[i] - BULLET_H//2, BULLET_FX_W, BULLET_H,
+               bullet_frame(b.age[i]) if TRAILS else 0)
+    if hud_due:
+        HUD.set(HUD_SCORE, G.score)
+    hs = HUD.fields[HUD_SCORE]
+    R.mark(RK_SCORE, hs.x, hs.y, hs.w, hs.h, hs.changes)
+    if SHOW_FPS:
+        if hud_due:
+            HUD.set(HUD_FPS, int(fps()))
+        hf = HUD.fields[HUD_FPS]
+        R.mark(RK_FPS, hf.x, hf.y, hf.w, hf.h, hf.changes)
+    show_prof = PROF.enabled and PROFILE_OVERLAY
+    if show_prof:
+        R.mark(RK_PROF, 0, H - PROF_BAR_H, W, PROF_BAR_H, LOOP.frames)  # new bar every frame
+    R.resolve()
+
     # enemies
-    for e in G.enemies:
-        draw_asteroid(e["x"], e["y"], e["sprite_idx"], e["rotation_frame"])
+    for i in range(e.count):
+        w, h = DRAW_SIZES[e.sprite_idx[i]]
+        if R.touches(e.x[i], e.y[i], w, h):
+            draw_asteroid(e.x[i], e.y[i], e.sprite_idx[i], frames[i], e.variant[i])
     # ship (using alien2 sprite)
-    try:
-        display.blit(sprite_alien2, int(G.ship_x), int(G.ship_y), sprite_alien2_transparent)
-    except:
-        # Fallback to ASCII art
-        draw_bitmap(G.ship_x, G.ship_y, SHIP_BMP, WHITE)
+    if R.touches(G.ship_x, G.ship_y, SHIP_W, SHIP_H):
+        if BLIT_OK:
+            display.blit(sprite_alien2, int(G.ship_x), int(G.ship_y), sprite_alien2_transparent)
+        else:
+            SHIP_FALLBACK.draw(display, G.ship_x, G.ship_y)
     # bullets (fire blaster effect)
-    for b in G.bullets:
-        # Create fire effect: alternate between orange and red based on bullet age
-        # Fast oscillation creates flickering fire effect
-        fire_cycle = (b["age"] * 8) % 1.0  # 8 cycles per second
-        bullet_color = ORANGE if fire_cycle < 0.5 else RED
-        
-        # Draw main bullet body
-        display.rect(int(b["x"]), int(b["y"] - BULLET_H//2), BULLET_W, BULLET_H, bullet_color, True)
-        
-        # Add fire trail effect (smaller trailing rectangles)
-        trail_color = RED if fire_cycle < 0.5 else ORANGE  # Opposite color for trail
-        display.rect(int(b["x"] - 2), int(b["y"] - BULLET_H//2), 2, BULLET_H, trail_color, True)
-
-    display.text("Score: " + str(G.score), 4, 4, WHITE)
-    display.commit()
-    time.sleep_ms(16)
\ No newline at end of file
+    for i in range(b.count):
+        bx, by = b.x[i], b.y[i]
+        if not R.touches(bx - 2, by - BULLET_H//2, BULLET_FX_W, BULLET_H):
+            continue
+        f = bullet_frame(b.age[i])
+        x, y = int(bx) - 2, int(by - BULLET_H//2)
+        if BLIT_OK:
+            if TRAILS:
+                BULLET_FX.draw(display, f, x, y)
+            else:
+                BULLET_CORE.draw(display, 0, x + 2, y)
+        elif not TRAILS:
+            display.rect(x + 2, y, BULLET_W, BULLET_H, ORANGE, True)
+        else:
+            # body and trail as two rects, colors swapping each flicker phase
+            display.rect(x + 2, y, BULLET_W, BULLET_H, RED if f else ORANGE, True)
+            display.rect(x, y, 2, BULLET_H, ORANGE if f else RED, True)
+
+    if R.touches(hs.x, hs.y, hs.w, hs.h):
+        HUD.draw(display, HUD_SCORE)
+    if SHOW_FPS and R.touches(hf.x, hf.y, hf.w, hf.h):
+        HUD.draw(display, HUD_FPS)
+    if show_prof:
+        PROF.draw(display, 0, H - PROF_BAR_H, W, PROF_BAR_H, PROF_COLORS, WHITE)
+    if DEBUG_DIRTY:
+        R.overlay(YELLOW)
+    PROF.lap(PH_DRAW)
+    R.commit()
+    PROF.lap(PH_COMMIT)
+
+def idle(spare_ms):
+    # background work in the time left before the frame's sleep
+    if spare_ms >= PREFETCH_MIN_MS:
+        SPRITES.prefetch(1)
+
+# the session file is closed however the run ends (stop, error, Ctrl-C)
+try:
+    if TASKS:
+        from engine import Scheduler  # only this runtime needs asyncio
+        SCHED = Scheduler()
+        SCHED.every("input", INPUT_MS, poll)
+        SCHED.every("sim", STEP_MS, lambda: step(LOOP.dt), catch_up=3)
+        RENDER_TASK = SCHED.every("render", RENDER_MS, render)
+        SCHED.every("audio", AUDIO_MS, audio)
+        SCHED.every("prefetch", PREFETCH_MS, lambda: SPRITES.prefetch(1))
+        SCHED.every("telemetry", CONSOLE_PRINT_INTERVAL, telemetry)
+        SCHED.run()
+    else:
+        LOOP.run(step, render, poll, feed=INPUT.feed if INPUT is not None else None, idle=idle)
+finally:
+    if REPLAY_MODE == "record":
+        INPUT.close()
+if REPLAYING:
+    INPUT.report()
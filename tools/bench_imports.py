@@ -0,0 +1,90 @@
+"""Import-time benchmark for the lazily loaded engine package.
+
+    python tools/bench_imports.py [runs] [--interp micropython]
+
+Each case imports into a fresh interpreter and reports the time taken,
+the heap still held afterwards and how many engine modules ended up
+loaded. `import engine` is measured against a failed import (on CPython
+that is mostly the importer warming up); the other cases against
+`import engine`, so they show what each part adds:
+`import engine` on its own, every submodule alone, the names Asteroid
+Dodge imports, and everything at once (what an eager package would cost
+on every start). Times are the best of `runs`. --interp runs the cases
+with another interpreter, e.g. the MicroPython unix port, which reports
+gc heap use instead of tracemalloc figures.
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATHS = [os.path.join(ROOT, "src"), os.path.join(ROOT, "tools", "host")]
+
+SUBMODULES = ("anim", "atlas", "bitmap", "collide", "colors", "controls", "governor",
+              "hud", "kernels", "loop", "procgen", "profiler", "render", "replay",
+              "sound", "spritecache", "sprites", "starfield", "store", "tasks")
+
+GAME = ("from engine import (rgb565, named, aabb, UniformGrid, mask_hits_rect, EntityStore, "
+        "Sequencer, DirtyRenderer, Starfield, GameLoop, Profiler, Recorder, Player, Hud, "
+        "Bitmap, SpriteStrip, probe_blit, probe_palette_blit, SpriteManager, AnimClock, "
+        "Controls, Governor)")
+
+# Runs in the child: measure one statement, print "us bytes modules"
+CHILD = r'''
+import sys, time, gc
+sys.path[0:0] = %r
+try:
+    ticks_us, ticks_diff, mem = time.ticks_us, time.ticks_diff, gc.mem_alloc
+    tracemalloc = None
+except AttributeError:
+    import tracemalloc
+    tracemalloc.start()
+    ticks_us = lambda: time.perf_counter_ns() // 1000
+    ticks_diff = lambda a, b: a - b
+    mem = lambda: tracemalloc.get_traced_memory()[0]
+gc.collect()
+m0 = mem()
+t0 = ticks_us()
+exec(%r)
+t = ticks_diff(ticks_us(), t0)
+gc.collect()
+used = mem() - m0
+print(t, used, len([k for k in sys.modules if k.startswith("engine.")]))
+'''
+
+def measure(interp, stmt, runs):
+    best = None
+    for _ in range(runs):
+        out = subprocess.run([interp, "-c", CHILD % (PATHS, stmt)], cwd=ROOT,
+                             capture_output=True, text=True)
+        if out.returncode:
+            raise SystemExit("%s failed:\n%s" % (stmt, out.stderr))
+        us, used, mods = (int(v) for v in out.stdout.split()[-3:])
+        if best is None or us < best[0]:
+            best = (us, used, mods)
+    return best
+
+def main():
+    args = sys.argv[1:]
+    interp = sys.executable
+    if "--interp" in args:
+        i = args.index("--interp")
+        interp = args[i + 1]
+        del args[i:i + 2]
+    runs = int(args[0]) if args else 5
+    cases = [("asteroid_dodge set", GAME)]
+    cases += [("engine." + m, "import engine." + m) for m in SUBMODULES]
+    cases.append(("everything", "; ".join("import engine." + m for m in SUBMODULES)))
+    # a failed lookup sets up the finders for every path entry
+    none_us, none_used, _ = measure(interp, "try:\n import _bench_none\nexcept ImportError:\n pass", runs)
+    base_us, base_used, mods = measure(interp, "import engine", runs)
+    print("%-20s %10s %10s %8s" % ("import", "ms", "KB", "modules"))
+    print("%-20s %10.2f %10.1f %8d" % (
+        "import engine", max(0, base_us - none_us) / 1000, max(0, base_used - none_used) / 1024, mods))
+    for name, stmt in cases:
+        us, used, mods = measure(interp, "import engine; " + stmt, runs)
+        print("%-20s %10.2f %10.1f %8d" % (
+            name, max(0, us - base_us) / 1000, max(0, used - base_used) / 1024, mods))
+
+if __name__ == "__main__":
+    main()
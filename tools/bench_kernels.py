@@ -0,0 +1,145 @@
+"""Parity check and speedup benchmark for engine.kernels.
+
+    python tools/bench_kernels.py [repeats]
+
+Runs every kernel on randomized inputs with both the plain Python build
+(kernels.PYTHON) and the active one (native/viper on MicroPython), checks
+that their outputs are identical and prints the time per call of each.
+On the host both builds are the Python one, so only the parity cases and
+the Python timings mean anything there; copy src/engine and this script
+to the watch to measure the emitters. Exits non-zero on any mismatch.
+"""
+import random
+import sys
+import time
+from array import array
+
+try:
+    import os.path
+    ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, os.path.join(ROOT, "src"))
+except ImportError:
+    pass  # MicroPython: run with src/ (or engine/) on the module path
+
+from engine import kernels
+from engine.procgen import AsteroidGenerator, BUMP_TABLE
+
+try:
+    ticks_us, ticks_diff = time.ticks_us, time.ticks_diff
+except AttributeError:
+    def ticks_us():
+        return int(time.perf_counter() * 1000000)
+    def ticks_diff(a, b):
+        return a - b
+
+# ---------- randomized cases per kernel ----------
+# A factory returns fresh argument buffers on every call, so both builds
+# start from the same state; the result is (return value, *argument buffers).
+
+def shade_cases(rnd):
+    cases = []
+    for w, h in ((20, 18), (24, 22), (36, 37), (9, 7)):
+        gen = AsteroidGenerator(w, h)
+        for _ in range(4):
+            shift = rnd.randrange(1024)
+            lxq, lyq = rnd.randint(-1024, 1024), rnd.randint(-1024, 1024)
+            def make(gen=gen, w=w, h=h, shift=shift, lxq=lxq, lyq=lyq):
+                p = array("h", gen.params)
+                p[2], p[4], p[5] = shift, lxq, lyq
+                return (gen.tab, BUMP_TABLE, bytearray(w * h), p)
+            cases.append(make)
+    return cases
+
+def darken_cases(rnd):
+    cases = []
+    for _ in range(16):
+        w, h = rnd.randint(1, 40), rnd.randint(1, 40)
+        sh = bytearray(rnd.randrange(5) for _ in range(w * h))
+        c = array("h", [rnd.randint(-6, w + 6), rnd.randint(-6, h + 6),
+                        rnd.randint(0, 6), rnd.randint(1, 3)])
+        cases.append(lambda sh=sh, w=w, h=h, c=c: (bytearray(sh), w, h, c))
+    return cases
+
+def gs4_cases(rnd, kind):
+    cases = []
+    for _ in range(16):
+        w, h = rnd.randint(1, 40), rnd.randint(1, 40)
+        half = (w + 1) >> 1
+        if kind == "pack":
+            src = bytearray(rnd.randrange(16) for _ in range(w * h))
+            cases.append(lambda src=src, w=w, h=h, out=half * h: (src, bytearray(out), w, h))
+        else:
+            src = bytearray(rnd.randrange(256) for _ in range(half * h))
+            out = w * h if kind == "unpack" else ((w + 7) >> 3) * h
+            cases.append(lambda src=src, w=w, h=h, out=out: (src, bytearray(out), w, h))
+    return cases
+
+def aabb_cases(rnd):
+    cases = []
+    for _ in range(64):
+        a = [rnd.uniform(-10, 140) for _ in range(2)]
+        b = [rnd.uniform(-10, 140) for _ in range(2)]
+        sa, sb = rnd.uniform(0, 30), rnd.uniform(0, 30)
+        args = (a[0], a[1], a[0] + sa, a[1] + sa, b[0], b[1], b[0] + sb, b[1] + sb)
+        cases.append(lambda args=args: args)
+    return cases
+
+def entity_cases(rnd, kind):
+    cases = []
+    for n in (0, 1, 16, 64):
+        xs = array("f", [rnd.uniform(-20, 150) for _ in range(64)])
+        vs = array("f", [rnd.uniform(-48, -24) for _ in range(64)])
+        if kind == "advance":
+            cases.append(lambda xs=xs, vs=vs, n=n: (array("f", xs), vs, n, 0.016))
+        else:
+            cases.append(lambda xs=xs, n=n: (array("f", xs), n, 2.56))
+    return cases
+
+def build_cases(seed):
+    rnd = random.Random(seed)
+    return (
+        ("shade_fixed", shade_cases(rnd)),
+        ("darken_circle", darken_cases(rnd)),
+        ("pack_gs4", gs4_cases(rnd, "pack")),
+        ("unpack_gs4", gs4_cases(rnd, "unpack")),
+        ("gs4_mask", gs4_cases(rnd, "mask")),
+        ("aabb", aabb_cases(rnd)),
+        ("advance", entity_cases(rnd, "advance")),
+        ("translate", entity_cases(rnd, "translate")),
+    )
+
+def result(fn, make):
+    args = make()
+    return [fn(*args)] + [bytes(a) if isinstance(a, (bytearray, array)) else a for a in args]
+
+def timed(fn, cases, repeats):
+    argsets = [make() for make in cases]
+    start = ticks_us()
+    for _ in range(repeats):
+        for args in argsets:
+            fn(*args)
+    return ticks_diff(ticks_us(), start) / (repeats * len(cases))
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print("kernels: %s" % kernels.EMITTER)
+    print("%-14s %6s %12s %12s %8s" % ("kernel", "cases", "python us", "active us", "speedup"))
+    failed = 0
+    for name, cases in build_cases(1):
+        py, fast = kernels.PYTHON[name], getattr(kernels, name)
+        bad = 0
+        for make in cases:
+            if result(py, make) != result(fast, make):
+                bad += 1
+        failed += bad
+        t_py = timed(py, cases, repeats)
+        t_fast = timed(fast, cases, repeats)
+        print("%-14s %6d %12.1f %12.1f %7.1fx%s" % (
+            name, len(cases), t_py, t_fast, t_py / t_fast if t_fast else 0,
+            "  MISMATCH x%d" % bad if bad else ""))
+    print("parity: " + ("%d mismatching cases" % failed if failed else "all outputs identical"))
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
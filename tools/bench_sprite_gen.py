@@ -0,0 +1,205 @@
+"""Benchmark: polar-table asteroid generator vs the original float loops.
+
+    python tools/bench_sprite_gen.py [repeats]
+
+Also checks that both produce byte-identical frames for every sprite size.
+"""
+import math
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[0:0] = [os.path.join(ROOT, "src"), os.path.join(ROOT, "src", "games")]
+
+from engine.procgen import ASTEROID_PALETTE, AsteroidGenerator
+import asteroid_assets
+
+# ---------- original generators, kept verbatim as the reference ----------
+def legacy_asteroid_pixels(w=36, h=37):
+    """Original per-pixel float generator (reference)"""
+    # Background is 0 (use this as the transparent color when blitting)
+    data = bytearray(w * h * 2)
+
+    def setpx(x, y, color):
+        i = 2 * (y * w + x)
+        data[i] = (color >> 8) & 0xFF
+        data[i + 1] = color & 0xFF
+
+    PALETTE = list(ASTEROID_PALETTE)
+
+    cx, cy = w // 2, h // 2
+    base_r = min(w, h) // 2 - 2
+
+    # build round asteroid with slight surface irregularity
+    for y in range(h):
+        for x in range(w):
+            dx, dy = x - cx, y - cy
+            r = math.sqrt(dx*dx + dy*dy)
+            ang = math.atan2(dy, dx)
+
+            # Much smaller irregularity for round shape (not star-fish)
+            # Just small surface bumps and dents
+            irregular = 0.8 * math.sin(7*ang) + 0.5 * math.sin(11*ang + 2.1)
+            radius = base_r + irregular
+
+            if r <= radius:
+                # fake lighting from upper-left
+                nx, ny = (dx / (r + 1e-6)), (dy / (r + 1e-6))
+                lx, ly = -0.4, -0.9
+                lambert = max(0.0, -(nx*lx + ny*ly))  # 0..1
+                if lambert < 0.25: shade = 0
+                elif lambert < 0.50: shade = 1
+                elif lambert < 0.75: shade = 2
+                else: shade = 3
+                setpx(x, y, PALETTE[shade])
+            else:
+                setpx(x, y, 0)  # transparent background
+
+    # add some darker craters (smaller and fewer)
+    def darken_circle(cx0, cy0, rad, deep=1):
+        r2 = rad*rad
+        for yy in range(max(0, cy0-rad), min(h, cy0+rad+1)):
+            for xx in range(max(0, cx0-rad), min(w, cx0+rad+1)):
+                dx, dy = xx - cx0, yy - cy0
+                if dx*dx + dy*dy <= r2:
+                    i = 2 * (yy * w + xx)
+                    col = (data[i] << 8) | data[i+1]
+                    if col != 0:
+                        # map to palette index and darken
+                        try:
+                            k = PALETTE.index(col)
+                        except ValueError:
+                            k = 1
+                        k = max(0, k - deep)
+                        newc = PALETTE[k]
+                        data[i]   = (newc >> 8) & 0xFF
+                        data[i+1] = newc & 0xFF
+
+    # Smaller, more realistic craters
+    darken_circle(cx-4, cy-3, 3, deep=2)
+    darken_circle(cx+3, cy-1, 2, deep=1)
+    darken_circle(cx-1, cy+4, 2, deep=2)
+
+    return data
+
+def legacy_rotating_asteroid_pixels(w=20, h=18, rotation_offset=0):
+    """Original per-pixel float generator with rotation (reference)"""
+    # Background is 0 (use this as the transparent color when blitting)
+    data = bytearray(w * h * 2)
+
+    def setpx(x, y, color):
+        i = 2 * (y * w + x)
+        data[i] = (color >> 8) & 0xFF
+        data[i + 1] = color & 0xFF
+
+    PALETTE = list(ASTEROID_PALETTE)
+
+    cx, cy = w // 2, h // 2
+    base_r = min(w, h) // 2 - 2
+
+    # build round asteroid with surface irregularity rotated by rotation_offset
+    for y in range(h):
+        for x in range(w):
+            dx, dy = x - cx, y - cy
+            r = math.sqrt(dx*dx + dy*dy)
+            ang = math.atan2(dy, dx) + rotation_offset  # Add rotation offset
+
+            # Small surface bumps and dents for natural look
+            irregular = 0.8 * math.sin(7*ang) + 0.5 * math.sin(11*ang + 2.1)
+            radius = base_r + irregular
+
+            if r <= radius:
+                # fake lighting from upper-left (also rotated)
+                light_angle = rotation_offset
+                nx, ny = (dx / (r + 1e-6)), (dy / (r + 1e-6))
+                lx, ly = -0.4 * math.cos(light_angle) - 0.9 * math.sin(light_angle), 0.4 * math.sin(light_angle) - 0.9 * math.cos(light_angle)
+                lambert = max(0.0, -(nx*lx + ny*ly))  # 0..1
+                if lambert < 0.25: shade = 0
+                elif lambert < 0.50: shade = 1
+                elif lambert < 0.75: shade = 2
+                else: shade = 3
+                setpx(x, y, PALETTE[shade])
+            else:
+                setpx(x, y, 0)  # transparent background
+
+    # add some craters (also rotated)
+    def darken_circle(cx0, cy0, rad, deep=1):
+        r2 = rad*rad
+        # Rotate crater position
+        crater_angle = math.atan2(cy0 - cy, cx0 - cx) + rotation_offset
+        crater_dist = math.sqrt((cx0 - cx)**2 + (cy0 - cy)**2)
+        rotated_cx = int(cx + crater_dist * math.cos(crater_angle))
+        rotated_cy = int(cy + crater_dist * math.sin(crater_angle))
+
+        for yy in range(max(0, rotated_cy-rad), min(h, rotated_cy+rad+1)):
+            for xx in range(max(0, rotated_cx-rad), min(w, rotated_cx+rad+1)):
+                dx, dy = xx - rotated_cx, yy - rotated_cy
+                if dx*dx + dy*dy <= r2:
+                    i = 2 * (yy * w + xx)
+                    col = (data[i] << 8) | data[i+1]
+                    if col != 0:
+                        try:
+                            k = PALETTE.index(col)
+                        except ValueError:
+                            k = 1
+                        k = max(0, k - deep)
+                        newc = PALETTE[k]
+                        data[i]   = (newc >> 8) & 0xFF
+                        data[i+1] = newc & 0xFF
+
+    # Add craters
+    darken_circle(cx-4, cy-3, 3, deep=2)
+    darken_circle(cx+3, cy-1, 2, deep=1)
+    darken_circle(cx-1, cy+4, 2, deep=2)
+
+    return data
+
+# ---------- benchmark ----------
+def sizes():
+    return [(c["w"], c["h"]) for c in asteroid_assets.ASTEROID_CONFIGS]
+
+def angles(frames=asteroid_assets.ROTATION_FRAMES):
+    return [(f * 2 * math.pi) / frames for f in range(frames)]
+
+STATIC_SIZE = (36, 37)  # the original static asteroid, non-rotating craters
+
+def run_legacy():
+    out = [legacy_asteroid_pixels(*STATIC_SIZE)]
+    for w, h in sizes():
+        for a in angles():
+            out.append(legacy_rotating_asteroid_pixels(w, h, a))
+    return out
+
+def run_tables():
+    out = [AsteroidGenerator(*STATIC_SIZE).pixels(0, rotate_craters=False)]
+    for w, h in sizes():
+        gen = AsteroidGenerator(w, h)
+        for a in angles():
+            out.append(gen.pixels(a))
+    return out
+
+def best_of(fn, repeats):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    t_old, old = best_of(run_legacy, repeats)
+    t_new, new = best_of(run_tables, repeats)
+    mismatches = [i for i, (a, b) in enumerate(zip(old, new)) if a != b]
+    print("frames: %d" % len(old))
+    print("legacy float loops : %8.2f ms" % (t_old * 1000))
+    print("polar tables       : %8.2f ms  (%.1fx)" % (t_new * 1000, t_old / t_new))
+    if mismatches:
+        print("MISMATCH in frames %s" % mismatches)
+        sys.exit(1)
+    print("output identical")
+
+if __name__ == "__main__":
+    main()
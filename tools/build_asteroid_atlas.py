@@ -0,0 +1,25 @@
+"""Bake the Asteroid Dodge sprite atlas on the host.
+
+    python tools/build_asteroid_atlas.py [output path]
+
+Upload the resulting asteroids.atlas next to asteroid_dodge.py on the watch.
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[0:0] = [os.path.join(ROOT, "src"), os.path.join(ROOT, "src", "games")]
+
+import asteroid_assets
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else asteroid_assets.ATLAS_PATH
+    start = time.perf_counter()
+    frames = asteroid_assets.build_atlas(path)
+    elapsed = time.perf_counter() - start
+    print("wrote %s: %d frames, %d bytes, hash %08x (%.2fs)" % (
+        path, len(frames), os.path.getsize(path), asteroid_assets.atlas_hash(), elapsed))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Headless CPython stand-in for the Artemis watch API (host runs only).
+
+- display: in-memory 128x128 RGB565 frame that counts draw calls, pixels
+  written and bytes committed. Partial commits (commit_rect) are only
+  offered when configured with partial=True.
+- buttons: replays a scripted list of (t_ms, button, pressed) events on
+  scan().
+- piezo: logs (t_ms, freq, ms) instead of sounding.
+- imu: get_accel_x/y/z() return a fixed tilt (flat by default, imu.set()).
+
+Configure with Artemis.setup(...) before importing a game. A frame limit
+stops the run from inside buttons.scan(), which every game calls once per
+frame, by raising HostStop.
+"""
+import time
+from framebuf import FrameBuffer, RGB565
+
+W, H = 128, 128
+
+class HostStop(BaseException):
+    """Raised to end a headless run; BaseException so game code passes it up"""
+
+class Display(FrameBuffer):
+    class Color:
+        Black = 0x0000
+        White = 0xFFFF
+        Red = 0xF800
+        Green = 0x07E0
+        Blue = 0x001F
+        Yellow = 0xFFE0
+        Cyan = 0x07FF
+        Magenta = 0xF81F
+        Orange = 0xFD20
+        Gray = 0x8410
+
+    _COUNTED = ("fill", "fill_rect", "rect", "pixel", "hline", "vline",
+                "line", "ellipse", "text", "blit", "scroll")
+
+    def __init__(self, partial=False):
+        super().__init__(bytearray(W * H * 2), W, H, RGB565)
+        self.calls = {}
+        self.commits = 0
+        self.pushed = 0        # bytes sent to the (imaginary) panel
+        if partial:
+            self.commit_rect = self._commit_rect
+        for name in self._COUNTED:
+            self._count(name)
+
+    def _count(self, name):
+        fn = getattr(FrameBuffer, name)
+        calls = self.calls
+        calls[name] = 0
+        def counted(*args, **kw):
+            calls[name] += 1
+            return fn(self, *args, **kw)
+        setattr(self, name, counted)
+
+    def commit(self):
+        self.commits += 1
+        self.pushed += W * H * 2
+
+    def _commit_rect(self, x, y, w, h):
+        self.commits += 1
+        self.pushed += w * h * 2
+
+    def stats(self):
+        return {"calls": dict(self.calls), "pixels": self.touched,
+                "commits": self.commits, "pushed": self.pushed}
+
+class Buttons:
+    Up, Down, Left, Right, Select, Back = range(6)
+    A = Select
+    NAMES = ("Up", "Down", "Left", "Right", "Select", "Back")
+
+    def __init__(self):
+        self.press_cb = {}
+        self.release_cb = {}
+        self.events = []       # (t_ms, button, pressed), sorted by time
+        self.next = 0
+        self.scans = 0
+        self.max_scans = None
+
+    def on_press(self, btn, cb):
+        self.press_cb[btn] = cb
+
+    def on_release(self, btn, cb):
+        self.release_cb[btn] = cb
+
+    def script(self, events):
+        self.events = sorted(events, key=lambda e: e[0])
+        self.next = 0
+
+    def scan(self):
+        self.scans += 1
+        if self.max_scans is not None and self.scans > self.max_scans:
+            raise HostStop()
+        now = time.ticks_ms()
+        ev = self.events
+        while self.next < len(ev) and ev[self.next][0] <= now:
+            _, btn, pressed = ev[self.next]
+            self.next += 1
+            cb = (self.press_cb if pressed else self.release_cb).get(btn)
+            if cb is not None:
+                cb()
+
+class Piezo:
+    def __init__(self):
+        self.log = []
+
+    def tone(self, freq, ms=0):
+        self.log.append((time.ticks_ms(), freq, ms))
+
+    def noTone(self):
+        pass
+
+class IMU:
+    """Watch lying flat unless a run sets a tilt with set()"""
+
+    def __init__(self):
+        self.set(0.0, 0.0, 1.0)
+
+    def set(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+    def get_accel_x(self):
+        return self.x
+
+    def get_accel_y(self):
+        return self.y
+
+    def get_accel_z(self):
+        return self.z
+
+display = Display()
+buttons = Buttons()
+piezo = Piezo()
+imu = IMU()
+
+def begin():
+    pass
+
+def setup(partial=False, events=(), max_frames=None):
+    """Reset the stand-in objects for a fresh run"""
+    global display, buttons, piezo, imu
+    display = Display(partial)
+    buttons = Buttons()
+    buttons.script(events)
+    buttons.max_scans = max_frames
+    piezo = Piezo()
+    imu = IMU()
+
+__all__ = ["Display", "Buttons", "display", "buttons", "piezo", "imu", "begin"]
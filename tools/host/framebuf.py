@@ -0,0 +1,209 @@
+"""CPython stand-in for MicroPython's framebuf module (host runs only).
+
+RGB565 pixels are stored high byte first, the same layout the games use
+for their sprite data, so a colour written with rect() and a sprite byte
+pair compare equal. Text uses placeholder 8x8 glyphs: the pixel counts are
+realistic, the shapes are not.
+"""
+
+MONO_VLSB = 0
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+
+def _glyph(ch):
+    # deterministic 8x8 pattern per character, blank for space
+    code = ord(ch)
+    if code == 32:
+        return (0,) * 8
+    h = (code * 2654435761) & 0xFFFFFFFF
+    return tuple(((h >> (row * 3)) | 0x18) & 0x7E if 0 < row < 7 else 0 for row in range(8))
+
+class FrameBuffer:
+    def __init__(self, buf, width, height, format, stride=None):
+        self.buf = buf
+        self.width = width
+        self.height = height
+        self.format = format
+        self.stride = width if stride is None else stride
+        if format in (MONO_HLSB, MONO_HMSB):
+            self.stride = (self.stride + 7) & ~7   # whole bytes per row
+        self.touched = 0   # pixels written, for host-side profiling
+
+    # ---------- raw pixel access ----------
+    def _get(self, x, y):
+        f, b, s = self.format, self.buf, self.stride
+        if f == RGB565:
+            i = 2 * (y * s + x)
+            return (b[i] << 8) | b[i + 1]
+        if f == MONO_HLSB:
+            return (b[(y * s + x) >> 3] >> (7 - (x & 7))) & 1
+        if f == MONO_HMSB:
+            return (b[(y * s + x) >> 3] >> (x & 7)) & 1
+        if f == MONO_VLSB:
+            return (b[(y >> 3) * s + x] >> (y & 7)) & 1
+        if f == GS4_HMSB:
+            v = b[(y * s + x) >> 1]
+            return (v >> 4) if not (x & 1) else (v & 0x0F)
+        if f == GS2_HMSB:
+            v = b[(y * s + x) >> 2]
+            return (v >> (6 - 2 * (x & 3))) & 3
+        if f == GS8:
+            return b[y * s + x]
+        raise ValueError("invalid format")
+
+    def _set(self, x, y, c):
+        f, b, s = self.format, self.buf, self.stride
+        self.touched += 1
+        if f == RGB565:
+            i = 2 * (y * s + x)
+            b[i] = (c >> 8) & 0xFF
+            b[i + 1] = c & 0xFF
+        elif f == MONO_HLSB:
+            i, bit = (y * s + x) >> 3, 0x80 >> (x & 7)
+            b[i] = (b[i] | bit) if c & 1 else (b[i] & ~bit)
+        elif f == MONO_HMSB:
+            i, bit = (y * s + x) >> 3, 1 << (x & 7)
+            b[i] = (b[i] | bit) if c & 1 else (b[i] & ~bit)
+        elif f == MONO_VLSB:
+            i, bit = (y >> 3) * s + x, 1 << (y & 7)
+            b[i] = (b[i] | bit) if c & 1 else (b[i] & ~bit)
+        elif f == GS4_HMSB:
+            i = (y * s + x) >> 1
+            if x & 1:
+                b[i] = (b[i] & 0xF0) | (c & 0x0F)
+            else:
+                b[i] = (b[i] & 0x0F) | ((c & 0x0F) << 4)
+        elif f == GS2_HMSB:
+            i, sh = (y * s + x) >> 2, 6 - 2 * (x & 3)
+            b[i] = (b[i] & ~(3 << sh)) | ((c & 3) << sh)
+        elif f == GS8:
+            b[y * s + x] = c & 0xFF
+        else:
+            raise ValueError("invalid format")
+
+    # ---------- drawing API ----------
+    def _put(self, x, y, c):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self._set(x, y, c)
+
+    def _fill(self, x, y, w, h, c):
+        x1, y1 = max(0, x), max(0, y)
+        x2, y2 = min(self.width, x + w), min(self.height, y + h)
+        if x1 >= x2 or y1 >= y2:
+            return
+        if self.format == RGB565:
+            row = bytes(((c >> 8) & 0xFF, c & 0xFF)) * (x2 - x1)
+            b, s = self.buf, self.stride
+            for yy in range(y1, y2):
+                i = 2 * (yy * s + x1)
+                b[i:i + len(row)] = row
+            self.touched += (x2 - x1) * (y2 - y1)
+            return
+        for yy in range(y1, y2):
+            for xx in range(x1, x2):
+                self._set(xx, yy, c)
+
+    # public methods go through _put/_fill only, so a subclass can count
+    # calls by wrapping them without counting internal use
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        if c is None:
+            return self._get(x, y)
+        self._set(x, y, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        self._fill(x, y, w, h, c)
+
+    def fill(self, c):
+        self._fill(0, 0, self.width, self.height, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self._fill(x, y, w, h, c)
+        else:
+            self._fill(x, y, w, 1, c)
+            self._fill(x, y + h - 1, w, 1, c)
+            self._fill(x, y, 1, h, c)
+            self._fill(x + w - 1, y, 1, h, c)
+
+    def hline(self, x, y, w, c):
+        self._fill(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self._fill(x, y, 1, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        dx, dy = abs(x2 - x1), -abs(y2 - y1)
+        sx, sy = (1 if x1 < x2 else -1), (1 if y1 < y2 else -1)
+        err = dx + dy
+        while True:
+            self._put(x1, y1, c)
+            if x1 == x2 and y1 == y2:
+                return
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+            if e2 <= dx:
+                err += dx
+                y1 += sy
+
+    def ellipse(self, x, y, xr, yr, c, f=False, m=0xF):
+        for yy in range(-yr, yr + 1):
+            for xx in range(-xr, xr + 1):
+                d = (xx * xx * yr * yr + yy * yy * xr * xr)
+                lim = xr * xr * yr * yr
+                if d <= lim and (f or d >= lim - 2 * max(xr, yr) * xr * yr):
+                    self._put(x + xx, y + yy, c)
+
+    def text(self, s, x, y, c=1):
+        for n, ch in enumerate(s):
+            rows = _glyph(ch)
+            for j in range(8):
+                bits = rows[j]
+                if bits:
+                    for i in range(8):
+                        if bits & (0x80 >> i):
+                            self._put(x + n * 8 + i, y + j, c)
+
+    def scroll(self, dx, dy):
+        w, h = self.width, self.height
+        src = [[self._get(x, y) for x in range(w)] for y in range(h)]
+        for y in range(h):
+            for x in range(w):
+                sx, sy = x - dx, y - dy
+                if 0 <= sx < w and 0 <= sy < h:
+                    self._set(x, y, src[sy][sx])
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        sw, sh = fbuf.width, fbuf.height
+        x1, y1 = max(0, -x), max(0, -y)
+        x2, y2 = min(sw, self.width - x), min(sh, self.height - y)
+        if x1 >= x2 or y1 >= y2:
+            return
+        get = fbuf._get
+        if fbuf.format == MONO_HLSB and palette is not None and palette._get(0, 0) == key:
+            # sparse 1-bit source: only visit set bits
+            b, s = fbuf.buf, fbuf.stride
+            col = palette._get(1, 0)
+            for sy in range(y1, y2):
+                for bx in range(x1 >> 3, ((x2 - 1) >> 3) + 1):
+                    v = b[((sy * s) >> 3) + bx]
+                    if v:
+                        for bit in range(8):
+                            sx = bx * 8 + bit
+                            if x1 <= sx < x2 and v & (0x80 >> bit):
+                                self._set(x + sx, y + sy, col)
+            return
+        for sy in range(y1, y2):
+            for sx in range(x1, x2):
+                c = get(sx, sy)
+                if palette is not None:
+                    c = palette._get(c, 0)
+                if c != key:
+                    self._set(x + sx, y + sy, c)
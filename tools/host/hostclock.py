@@ -0,0 +1,59 @@
+"""Virtual clock for host runs: stands in for MicroPython's time.ticks_*.
+
+Sleeping advances the clock instantly, so a game runs as fast as the host
+can execute it while seeing the same timestamps it would on the watch.
+With real_work=True the clock also advances by the host time spent between
+calls, which lets an overloaded frame look overloaded to the game loop.
+"""
+import time
+
+class VirtualClock:
+    def __init__(self, start_ms=0, real_work=False, work_scale=1.0):
+        self.us = start_ms * 1000
+        self.real_work = real_work
+        self.work_scale = work_scale   # host->device slowdown when real_work
+        self.slept_ms = 0
+        self._mark = time.perf_counter()
+
+    def _sync(self):
+        if self.real_work:
+            now = time.perf_counter()
+            self.us += int((now - self._mark) * 1e6 * self.work_scale)
+            self._mark = now
+
+    def ticks_us(self):
+        self._sync()
+        return self.us
+
+    def ticks_ms(self):
+        self._sync()
+        return self.us // 1000
+
+    def ticks_diff(self, a, b):
+        return a - b
+
+    def ticks_add(self, t, delta):
+        return t + delta
+
+    def sleep_us(self, us):
+        self._sync()
+        if us > 0:
+            self.us += int(us)
+        self._mark = time.perf_counter()
+
+    def sleep_ms(self, ms):
+        if ms > 0:
+            self.slept_ms += ms
+        self.sleep_us(ms * 1000)
+
+    def sleep(self, s):
+        self.sleep_ms(int(s * 1000))
+
+    def advance_ms(self, ms):
+        self.us += int(ms * 1000)
+
+def install(clock):
+    """Patch the time module so `import time` in game code sees the clock"""
+    for name in ("ticks_ms", "ticks_us", "ticks_diff", "ticks_add", "sleep_ms", "sleep_us"):
+        setattr(time, name, getattr(clock, name))
+    return clock
@@ -0,0 +1,148 @@
+"""Run a game headless on the host with the Artemis stand-in in tools/host.
+
+    python tools/run_headless.py                       # asteroid_dodge, 600 frames
+    python tools/run_headless.py --frames 3000 --profile
+    python tools/run_headless.py --partial --real-work --events inputs.txt
+    python tools/run_headless.py --set PROFILE=True --set 'REPLAY_MODE="record"'
+    python tools/run_headless.py --set STRESS=True --real-work --work-scale 20
+
+The virtual clock makes sleeps free, so the run goes as fast as the host
+allows while the game sees watch timestamps. Events files hold one
+"t_ms button press|release" per line (button names as in Artemis.Buttons);
+without one a demo script holds fire and weaves up and down.
+
+With --partial the run fails when more than --max-full percent of the
+frames fell back to a full repaint, so a change that defeats the dirty
+rectangles shows up.
+
+--set NAME=VALUE replaces a top-level `NAME = ...` line of the game before
+it runs, for flipping config flags without editing the file.
+
+Runs in a scratch directory (--workdir to choose one) so generated assets
+and session files do not land in the tree.
+"""
+import argparse, cProfile, os, pstats, re, sys, tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "tools", "host"))
+sys.path.insert(0, os.path.join(ROOT, "src", "games"))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import hostclock
+import Artemis
+from engine.render import DirtyRenderer
+
+def demo_events(frames, frame_ms=16):
+    """Fire every 250 ms and alternate up/down holds every second"""
+    end = frames * frame_ms
+    ev = []
+    for t in range(0, end, 250):
+        ev.append((t, Artemis.Buttons.Select, True))
+        ev.append((t + 40, Artemis.Buttons.Select, False))
+    for n, t in enumerate(range(500, end, 1000)):
+        btn = Artemis.Buttons.Up if n % 2 else Artemis.Buttons.Down
+        ev.append((t, btn, True))
+        ev.append((t + 600, btn, False))
+    return ev
+
+def load_events(path):
+    ev = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#")[0].split()
+            if not line:
+                continue
+            t, name, state = line
+            ev.append((int(t), getattr(Artemis.Buttons, name), state == "press"))
+    return ev
+
+def apply_settings(src, settings):
+    for item in settings:
+        name, value = item.split("=", 1)
+        src, n = re.subn(r"(?m)^%s = .*$" % re.escape(name), lambda m: "%s = %s" % (name, value), src, 1)
+        if not n:
+            raise SystemExit("no top-level assignment to " + name)
+    return src
+
+def run(game, frames, events, partial=False, real_work=False, seed=None, settings=(),
+        work_scale=1.0):
+    """Execute the game module until the frame limit; returns its globals"""
+    clock = hostclock.install(hostclock.VirtualClock(real_work=real_work, work_scale=work_scale))
+    Artemis.setup(partial=partial, events=events, max_frames=frames)
+    if seed is not None:
+        import random
+        random.seed(seed)
+    path = os.path.join(ROOT, "src", "games", game + ".py")
+    with open(path) as f:
+        code = compile(apply_settings(f.read(), settings), path, "exec")
+    g = {"__name__": "__main__", "__file__": path}
+    try:
+        exec(code, g)
+    except Artemis.HostStop:
+        pass
+    return g, clock
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--game", default="asteroid_dodge")
+    ap.add_argument("--frames", type=int, default=600)
+    ap.add_argument("--events", help="scripted button events file")
+    ap.add_argument("--partial", action="store_true", help="display offers commit_rect")
+    ap.add_argument("--max-full", type=float, default=30,
+                    help="with --partial, fail above this percentage of full repaints")
+    ap.add_argument("--real-work", action="store_true",
+                    help="host compute time also advances the clock")
+    ap.add_argument("--work-scale", type=float, default=1.0,
+                    help="with --real-work, multiply host compute time (device slowdown)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--profile", action="store_true")
+    ap.add_argument("--top", type=int, default=25)
+    ap.add_argument("--set", action="append", default=[], metavar="NAME=VALUE")
+    ap.add_argument("--workdir")
+    args = ap.parse_args()
+
+    if any(s.startswith("RUNTIME=") and "tasks" in s for s in args.set):
+        args.real_work = True  # asyncio sleeps in host time, so ticks must follow it
+    events = load_events(args.events) if args.events else demo_events(args.frames)
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+    os.chdir(args.workdir or tempfile.mkdtemp(prefix="artemis-host-"))
+    prof = cProfile.Profile() if args.profile else None
+    if prof:
+        prof.enable()
+    g, clock = run(args.game, args.frames, events, args.partial, args.real_work,
+                   args.seed, args.set, args.work_scale)
+    if prof:
+        prof.disable()
+
+    d = Artemis.display.stats()
+    loop = g.get("LOOP")
+    if loop is not None and loop.frames:
+        frames = loop.frames
+    else:
+        frames = d["commits"]  # not driven by GameLoop (e.g. tasks): count pushes
+    print("--- headless run: %s ---" % args.game)
+    print("frames: %d  virtual time: %.1f s  slept: %d ms" % (
+        frames, clock.ticks_ms() / 1000, clock.slept_ms))
+    print("commits: %d  bytes pushed: %d (%.0f per frame)" % (
+        d["commits"], d["pushed"], d["pushed"] / max(1, frames)))
+    print("pixels written: %d (%.0f per frame)" % (d["pixels"], d["pixels"] / max(1, frames)))
+    print("draw calls: " + ", ".join("%s=%d" % kv for kv in sorted(d["calls"].items()) if kv[1]))
+    print("tones: %d" % len(Artemis.piezo.log))
+    if loop is not None:
+        print("loop: fps %.1f, slow frames %d, skipped renders %d" % (
+            loop.fps, loop.slow_frames, loop.skipped_renders))
+    renderers = [v for v in g.values() if isinstance(v, DirtyRenderer)]
+    for r in renderers:
+        pct = 100.0 * r.full_frames / max(1, r.frames)
+        print("dirty renderer: %d of %d frames full repaints (%.0f%%)" % (
+            r.full_frames, r.frames, pct))
+    if prof:
+        pstats.Stats(prof).sort_stats("cumulative").print_stats(args.top)
+    if args.partial:
+        for r in renderers:
+            if 100.0 * r.full_frames / max(1, r.frames) > args.max_full:
+                sys.exit("too many full repaints: over %g%% of the frames" % args.max_full)
+
+if __name__ == "__main__":
+    main()